@@ -1,9 +1,14 @@
 import os
 import json
+from concurrent.futures import ProcessPoolExecutor
 import numpy as np
 import cv2
 from .scale_converter import ScaleConverter
 
+def _init_worker():
+    """Limit OpenCV to one thread per worker; the pool provides the parallelism."""
+    cv2.setNumThreads(1)
+
 class ImageProcessor:
     """
     Processes building plans to extract architectural features.
@@ -75,3 +80,27 @@ class ImageProcessor:
             ]
         
         return result
+    
+    def process_batch(self, file_paths, plan_type='floor_plan', orientation=None, output_dir=None):
+        """
+        Process several building plan images in parallel worker processes.
+        
+        Args:
+            file_paths (list): Paths to the image files
+            plan_type (str): Type of plan ('floor_plan' or 'elevation')
+            orientation (str, optional): Orientation for elevations ('north', 'east', 'south', 'west')
+            output_dir (str, optional): Directory to save output files
+            
+        Returns:
+            list: Processed data for each file, in the order given
+        """
+        if not file_paths:
+            return []
+        
+        max_workers = min(len(file_paths), os.cpu_count() or 1)
+        with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker) as executor:
+            futures = [
+                executor.submit(self.process_building_plan, file_path, plan_type, orientation, output_dir)
+                for file_path in file_paths
+            ]
+            return [future.result() for future in futures]
@@ -1,5 +1,13 @@
 import os
 import json
+import numpy as np
+
+# Prefer orjson for writing model files, fall back to the standard library
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
 
 class ReconstructionCoordinator:
     """
@@ -55,18 +63,50 @@ class ReconstructionCoordinator:
             }
             
             # Save the model file
-            with open(model_path, 'w') as f:
-                json.dump(model_data, f)
+            self._write_json(model_path, model_data)
             
             # Create a mock OBJ file
             obj_path = os.path.join(output_dir, 'building_model.obj')
-            with open(obj_path, 'w') as f:
-                f.write("# Building Model OBJ File\n")
-                f.write("# Vertices\n")
-                for v in model_data['vertices']:
-                    f.write(f"v {v[0]} {v[1]} {v[2]}\n")
-                f.write("# Faces\n")
-                for face in model_data['faces']:
-                    f.write(f"f {face[0]+1} {face[1]+1} {face[2]+1} {face[3]+1}\n")
+            self._write_obj(obj_path, model_data['vertices'], model_data['faces'])
         
         return result
+    
+    def _write_json(self, json_path, data):
+        """
+        Write data to a compact JSON file.
+        
+        Args:
+            json_path (str): Path of the JSON file
+            data: JSON-serializable data, may contain numpy arrays
+        """
+        # orjson serializes numpy arrays natively and writes bytes in one call
+        if ORJSON_AVAILABLE:
+            with open(json_path, 'wb') as f:
+                f.write(orjson.dumps(data, option=orjson.OPT_SERIALIZE_NUMPY))
+            return
+        
+        with open(json_path, 'w') as f:
+            json.dump(data, f, separators=(',', ':'))
+    
+    def _write_obj(self, obj_path, vertices, faces):
+        """
+        Write a mesh to an OBJ file.
+        
+        Args:
+            obj_path (str): Path of the OBJ file
+            vertices: Vertex coordinates, shape (N, 3)
+            faces: Zero-based vertex indices of each face, shape (M, K)
+        """
+        vertices = np.asarray(vertices, dtype=np.float64).reshape(-1, 3)
+        
+        # OBJ vertex indices are one-based
+        faces = np.asarray(faces, dtype=np.int64)
+        faces = faces.reshape(len(faces), -1) + 1
+        
+        # Format all rows in one pass per block rather than a write per line
+        with open(obj_path, 'w', buffering=1 << 20) as f:
+            f.write("# Building Model OBJ File\n")
+            f.write("# Vertices\n")
+            np.savetxt(f, vertices, fmt='v %.6f %.6f %.6f')
+            f.write("# Faces\n")
+            np.savetxt(f, faces, fmt='f' + ' %d' * faces.shape[1])
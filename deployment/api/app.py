@@ -1,10 +1,21 @@
 import os
 import json
+import time
+import uuid
+import threading
+from concurrent.futures import ThreadPoolExecutor
 import flask
-from flask import Flask, request, jsonify, send_file
+from flask import Flask, request, jsonify, send_from_directory
 from flask_cors import CORS
 from werkzeug.utils import secure_filename
 
+# Prefer orjson for writing result files, fall back to the standard library
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 # Import application modules
 from image_processing.image_processor import ImageProcessor
 from reconstruction.reconstruction_coordinator import ReconstructionCoordinator
@@ -17,13 +28,77 @@ CORS(app)
 # Configure upload folder
 UPLOAD_FOLDER = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'uploads')
 RESULTS_FOLDER = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'results')
+UPLOAD_BUFFER_SIZE = 1024 * 1024
 os.makedirs(UPLOAD_FOLDER, exist_ok=True)
 os.makedirs(RESULTS_FOLDER, exist_ok=True)
 
-# Initialize modules
-image_processor = ImageProcessor()
-reconstruction_coordinator = ReconstructionCoordinator()
-gbxml_manager = GbXMLManager()
+# Modules are created on first use, so importing the app stays cheap and
+# each worker process only builds what its requests need. Creation happens
+# under a lock, so concurrent first requests share one instance
+services = {}
+services_lock = threading.Lock()
+
+def get_service(name, factory):
+    """
+    Get a shared module instance, creating it on first use.
+    
+    Args:
+        name (str): Name the instance is stored under
+        factory (callable): Creates the instance
+        
+    Returns:
+        object: The shared instance
+    """
+    with services_lock:
+        service = services.get(name)
+        if service is None:
+            service = services[name] = factory()
+        return service
+
+def get_image_processor():
+    """Get the shared image processor."""
+    return get_service('image_processor', ImageProcessor)
+
+def get_reconstruction_coordinator():
+    """Get the shared reconstruction coordinator."""
+    return get_service('reconstruction_coordinator', ReconstructionCoordinator)
+
+def get_gbxml_manager():
+    """Get the shared gbXML manager."""
+    return get_service('gbxml_manager', GbXMLManager)
+
+# Background model generation jobs, keyed by job ID. Every build writes the
+# same files in RESULTS_FOLDER, so builds run one at a time
+job_executor = ThreadPoolExecutor(max_workers=1)
+jobs = {}
+build_lock = threading.Lock()
+
+# Finished jobs that are never polled are dropped after this many seconds
+JOB_TTL = 3600
+
+# Times at which jobs finished, keyed by job ID
+job_finished = {}
+jobs_lock = threading.Lock()
+
+def expire_jobs():
+    """Forget jobs that finished more than JOB_TTL seconds ago."""
+    cutoff = time.monotonic() - JOB_TTL
+    with jobs_lock:
+        for job_id, finished in list(job_finished.items()):
+            if finished < cutoff:
+                del job_finished[job_id]
+                jobs.pop(job_id, None)
+
+def forget_job(job_id):
+    """
+    Forget a background job.
+    
+    Args:
+        job_id (str): ID of the job
+    """
+    with jobs_lock:
+        jobs.pop(job_id, None)
+        job_finished.pop(job_id, None)
 
 @app.route('/api/health', methods=['GET'])
 def health_check():
@@ -45,16 +120,16 @@ def upload_file():
     orientation = request.form.get('orientation', 'unknown')
     floor_level = request.form.get('floorLevel', '0')
     
-    # Save file
+    # Save file, streaming the upload to disk in 1 MiB chunks
     filename = secure_filename(file.filename)
     file_path = os.path.join(UPLOAD_FOLDER, filename)
-    file.save(file_path)
+    file.save(file_path, buffer_size=UPLOAD_BUFFER_SIZE)
     
     # Process file based on type
     try:
         if file_type == 'floorPlan':
             # Process floor plan
-            result = image_processor.process_building_plan(
+            result = get_image_processor().process_building_plan(
                 file_path, 
                 plan_type='floor_plan',
                 output_dir=RESULTS_FOLDER
@@ -63,7 +138,7 @@ def upload_file():
             
         elif file_type == 'elevation':
             # Process elevation
-            result = image_processor.process_building_plan(
+            result = get_image_processor().process_building_plan(
                 file_path, 
                 plan_type='elevation',
                 orientation=orientation,
@@ -77,8 +152,15 @@ def upload_file():
         result_filename = f"{os.path.splitext(filename)[0]}_processed.json"
         result_path = os.path.join(RESULTS_FOLDER, result_filename)
         
-        with open(result_path, 'w') as f:
-            json.dump(result, f)
+        if ORJSON_AVAILABLE:
+            # orjson serializes numpy values natively and writes bytes in one call
+            with open(result_path, 'wb') as f:
+                f.write(orjson.dumps(
+                    result, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+                ))
+        else:
+            with open(result_path, 'w') as f:
+                json.dump(result, f)
             
         return jsonify({
             'success': True,
@@ -102,7 +184,7 @@ def set_scale():
         
     try:
         # Set scale in the image processor
-        scale_factor = image_processor.scale_converter.set_scale(
+        scale_factor = get_image_processor().scale_converter.set_scale(
             data['imageId'],
             data['pixelLength'],
             data['realLength'],
@@ -117,50 +199,119 @@ def set_scale():
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
-@app.route('/api/generate-model', methods=['POST'])
-def generate_model():
-    """Generate 3D model from processed files."""
-    data = request.json
+def build_model(floor_plans, elevations, results_folder):
+    """
+    Generate the 3D model and gbXML file from processed files.
     
-    if not data or 'floorPlans' not in data or 'elevations' not in data:
-        return jsonify({'error': 'Missing required parameters'}), 400
-        
-    try:
-        # Get file paths
-        floor_plan_files = [os.path.join(RESULTS_FOLDER, fp) for fp in data['floorPlans']]
-        elevation_files = [os.path.join(RESULTS_FOLDER, el) for el in data['elevations']]
+    Builds are serialized, so concurrent requests and background jobs never
+    write the output files at the same time.
+    
+    Args:
+        floor_plans (list): Processed floor plan file names
+        elevations (list): Processed elevation file names
+        results_folder (str): Directory holding processed files and outputs
         
+    Returns:
+        dict: Names of the generated files
+    """
+    # Get file paths
+    floor_plan_files = [os.path.join(results_folder, fp) for fp in floor_plans]
+    elevation_files = [os.path.join(results_folder, el) for el in elevations]
+    
+    with build_lock:
         # Generate 3D model
-        result = reconstruction_coordinator.process_building(
+        get_reconstruction_coordinator().process_building(
             floor_plan_files,
             elevation_files,
-            output_dir=RESULTS_FOLDER
+            output_dir=results_folder
         )
         
         # Generate gbXML
-        gbxml_path = gbxml_manager.convert_building_model(
-            os.path.join(RESULTS_FOLDER, 'building_model.json'),
-            output_dir=RESULTS_FOLDER
+        get_gbxml_manager().convert_building_model(
+            os.path.join(results_folder, 'building_model.json'),
+            output_dir=results_folder
+        )
+    
+    return {
+        'model_file': 'building_model.obj',
+        'gbxml_file': 'building_model.gbxml'
+    }
+
+@app.route('/api/generate-model', methods=['POST'])
+def generate_model():
+    """
+    Generate 3D model from processed files.
+    
+    With 'async' set in the request the model is generated in the background
+    and a job ID is returned for polling /api/jobs/<job_id>.
+    """
+    data = request.json
+    
+    if not data or 'floorPlans' not in data or 'elevations' not in data:
+        return jsonify({'error': 'Missing required parameters'}), 400
+    
+    if data.get('async'):
+        expire_jobs()
+        
+        job_id = uuid.uuid4().hex
+        job = job_executor.submit(
+            build_model, data['floorPlans'], data['elevations'], RESULTS_FOLDER
         )
+        with jobs_lock:
+            jobs[job_id] = job
         
-        return jsonify({
-            'success': True,
-            'model_file': 'building_model.obj',
-            'gbxml_file': 'building_model.gbxml'
-        })
+        # Record when the job finishes, so it expires even if never polled
+        def record_finish(_):
+            with jobs_lock:
+                if job_id in jobs:
+                    job_finished[job_id] = time.monotonic()
+        job.add_done_callback(record_finish)
+        
+        return jsonify({'success': True, 'job_id': job_id}), 202
+        
+    try:
+        result = build_model(data['floorPlans'], data['elevations'], RESULTS_FOLDER)
+        
+        return jsonify({'success': True, **result})
         
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+@app.route('/api/jobs/<job_id>', methods=['GET'])
+def get_job(job_id):
+    """
+    Get the status of a background model generation job.
+    
+    A finished job is forgotten once its status has been returned, or
+    JOB_TTL seconds after it finished if it is never polled.
+    """
+    expire_jobs()
+    job = jobs.get(job_id)
+    
+    if job is None:
+        return jsonify({'error': 'Job not found'}), 404
+    
+    if not job.done():
+        return jsonify({'job_id': job_id, 'status': 'running'})
+    
+    forget_job(job_id)
+    error = job.exception()
+    if error is not None:
+        return jsonify({'job_id': job_id, 'status': 'failed', 'error': str(error)})
+    
+    return jsonify({'job_id': job_id, 'status': 'finished', 'success': True, **job.result()})
+
 @app.route('/api/results/<filename>', methods=['GET'])
 def get_result_file(filename):
     """Get a result file."""
-    file_path = os.path.join(RESULTS_FOLDER, secure_filename(filename))
+    filename = secure_filename(filename)
+    file_path = os.path.join(RESULTS_FOLDER, filename)
     
     if not os.path.exists(file_path):
         return jsonify({'error': 'File not found'}), 404
-        
-    return send_file(file_path)
+    
+    # Answer repeated fetches of an unchanged file with 304 Not Modified
+    return send_from_directory(RESULTS_FOLDER, filename, conditional=True, etag=True)
 
 if __name__ == '__main__':
     app.run(host='0.0.0.0', port=5000, debug=False)
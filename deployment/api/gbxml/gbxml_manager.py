@@ -1,7 +1,63 @@
 import os
 import json
-import xml.etree.ElementTree as ET
-import xml.dom.minidom as minidom
+import hashlib
+import tempfile
+import numpy as np
+
+# Prefer orjson for parsing model files, fall back to the standard library
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+GBXML_NAMESPACE = 'http://www.gbxml.org/schema'
+GBXML_VERSION = '6.01'
+INDENT = '  '
+
+# Suffix of the file recording the content hash of the converted model
+KEY_SUFFIX = '.blake2b'
+
+# Hidden subdirectory of the output directory holding the hash files, so they
+# are not listed or served next to the results
+KEY_DIR = '.gbxml_cache'
+
+# Bump whenever the generated document changes, so files converted by an
+# older version are regenerated
+GENERATOR_VERSION = '1'
+
+# Precomputed newline + indentation bytes, indexed by nesting depth
+_NEWLINES = tuple(b'\n' + INDENT.encode() * depth for depth in range(9))
+
+# Fixed parts of the document, preformatted as bytes
+_HEADER = (
+    b"<?xml version='1.0' encoding='utf-8'?>\n"
+    + f'<gbXML xmlns="{GBXML_NAMESPACE}" version="{GBXML_VERSION}">'.encode()
+    + _NEWLINES[1] + b'<Campus id="campus-1">'
+    + _NEWLINES[2] + b'<Building id="building-1">'
+    + _NEWLINES[3] + b'<Space id="space-1">'
+)
+_FOOTER = (
+    _NEWLINES[3] + b'</Space>'
+    + _NEWLINES[2] + b'</Building>'
+    + _NEWLINES[1] + b'</Campus>'
+    + _NEWLINES[0] + b'</gbXML>'
+)
+_SURFACE_OPEN = (
+    _NEWLINES[4] + b'<Surface id="surface-%d" surfaceType="ExteriorWall">'
+    + _NEWLINES[5] + b'<PlanarGeometry>'
+    + _NEWLINES[6] + b'<PolyLoop>'
+)
+_SURFACE_CLOSE = (
+    _NEWLINES[6] + b'</PolyLoop>'
+    + _NEWLINES[5] + b'</PlanarGeometry>'
+    + _NEWLINES[4] + b'</Surface>'
+)
+_CARTESIAN_POINT = (
+    _NEWLINES[7] + b'<CartesianPoint>'
+    + (_NEWLINES[8] + b'<Coordinate>%.6f</Coordinate>') * 3
+    + _NEWLINES[7] + b'</CartesianPoint>'
+)
 
 class GbXMLManager:
     """
@@ -16,6 +72,12 @@ class GbXMLManager:
         """
         Convert a building model to gbXML format.
         
+        The document is assembled from preformatted byte templates and
+        written in a single call. A hash of the model file contents is stored
+        in the output directory, so converting the same model again with the
+        same generator version returns the existing file without
+        regenerating it.
+        
         Args:
             model_file (str): Path to the building model file
             output_dir (str, optional): Directory to save output files
@@ -24,58 +86,88 @@ class GbXMLManager:
             str: Path to the generated gbXML file
         """
         # Load the building model
-        with open(model_file, 'r') as f:
-            model_data = json.load(f)
+        with open(model_file, 'rb') as f:
+            raw = f.read()
         
-        # Create a simple gbXML document
-        gbxml = ET.Element('gbXML')
-        gbxml.set('xmlns', 'http://www.gbxml.org/schema')
-        gbxml.set('version', '6.01')
+        if not output_dir:
+            return None
         
-        # Add campus element
-        campus = ET.SubElement(gbxml, 'Campus')
-        campus.set('id', 'campus-1')
+        gbxml_path = os.path.join(output_dir, 'building_model.gbxml')
+        key_path = os.path.join(output_dir, KEY_DIR, 'building_model.gbxml' + KEY_SUFFIX)
         
-        # Add building element
-        building = ET.SubElement(campus, 'Building')
-        building.set('id', 'building-1')
+        # Output is a pure function of the model file and the generator, so
+        # an existing file converted from identical contents by the same
+        # generator version can be returned as is
+        hasher = hashlib.blake2b(GENERATOR_VERSION.encode() + b'\0', digest_size=16)
+        hasher.update(raw)
+        key = hasher.hexdigest()
+        if os.path.exists(gbxml_path) and self._read_key(key_path) == key:
+            return gbxml_path
         
-        # Add space element
-        space = ET.SubElement(building, 'Space')
-        space.set('id', 'space-1')
+        model_data = orjson.loads(raw) if ORJSON_AVAILABLE else json.loads(raw)
         
-        # Add surface elements
-        for i, face in enumerate(model_data['faces']):
-            surface = ET.SubElement(space, 'Surface')
-            surface.set('id', f'surface-{i+1}')
-            surface.set('surfaceType', 'ExteriorWall')
-            
-            # Add polyloop
-            planar_geometry = ET.SubElement(surface, 'PlanarGeometry')
-            polyloop = ET.SubElement(planar_geometry, 'PolyLoop')
-            
-            # Add points
-            for vertex_idx in face:
-                vertex = model_data['vertices'][vertex_idx]
-                point = ET.SubElement(polyloop, 'CartesianPoint')
-                
-                # Add coordinates
-                for j, coord in enumerate(['X', 'Y', 'Z']):
-                    coordinate = ET.SubElement(point, 'Coordinate')
-                    coordinate.text = str(vertex[j])
+        # Format each vertex's CartesianPoint once; faces share vertices
+        vertices = np.asarray(model_data['vertices'], dtype=np.float64).reshape(-1, 3)
+        points = [_CARTESIAN_POINT % tuple(vertex) for vertex in vertices.tolist()]
         
-        # Save the gbXML file
-        if output_dir:
-            gbxml_path = os.path.join(output_dir, 'building_model.gbxml')
-            
-            # Convert to string and pretty-print
-            rough_string = ET.tostring(gbxml, 'utf-8')
-            reparsed = minidom.parseString(rough_string)
-            pretty_xml = reparsed.toprettyxml(indent="  ")
-            
-            with open(gbxml_path, 'w') as f:
-                f.write(pretty_xml)
-            
-            return gbxml_path
+        # The schema is fixed, so the document is assembled directly as bytes
+        out = bytearray(_HEADER)
+        for surface_number, face in enumerate(model_data['faces'], 1):
+            out += _SURFACE_OPEN % surface_number
+            out += b''.join([points[vertex_idx] for vertex_idx in face])
+            out += _SURFACE_CLOSE
+        out += _FOOTER
         
-        return None
+        # Forget the previous conversion before touching the output, so its
+        # hash can never be paired with the new document
+        try:
+            os.remove(key_path)
+        except FileNotFoundError:
+            pass
+        
+        # Write to a temporary file and rename it into place, so a partially
+        # written file is never picked up as a cached conversion
+        self._write_atomic(output_dir, gbxml_path, out)
+        
+        # Record which model contents the file was generated from, last
+        key_dir = os.path.dirname(key_path)
+        os.makedirs(key_dir, exist_ok=True)
+        self._write_atomic(key_dir, key_path, key.encode())
+        
+        return gbxml_path
+    
+    def _write_atomic(self, directory, path, data):
+        """
+        Write a file through a temporary file renamed into place.
+        
+        Args:
+            directory (str): Directory for the temporary file, on the same
+                filesystem as path
+            path (str): Path of the file to write
+            data (bytes): File contents
+        """
+        fd, temp_path = tempfile.mkstemp(dir=directory)
+        os.chmod(temp_path, 0o644)
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+        except BaseException:
+            os.remove(temp_path)
+            raise
+        os.replace(temp_path, path)
+    
+    def _read_key(self, key_path):
+        """
+        Read the content hash recorded for a previous conversion.
+        
+        Args:
+            key_path (str): Path to the hash file
+            
+        Returns:
+            str: Recorded hash, or None if there is none
+        """
+        try:
+            with open(key_path) as f:
+                return f.read()
+        except OSError:
+            return None
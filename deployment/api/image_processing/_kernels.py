@@ -0,0 +1,49 @@
+import numpy as np
+
+# Numba is optional; without it the kernels run as plain Python
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+    
+    def njit(*args, **kwargs):
+        """Fallback decorator that leaves the function uncompiled."""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func
+
+@njit(cache=True)
+def filter_door_lines(segments, min_length, max_length):
+    """
+    Select line segments whose length lies strictly between two bounds.
+    
+    Lengths and angles are computed in a single fused pass, and only the
+    kept segments are written out.
+    
+    Args:
+        segments: Line segments as an (N, 4) array of x1, y1, x2, y2
+        min_length: Exclusive lower bound on the segment length
+        max_length: Exclusive upper bound on the segment length
+        
+    Returns:
+        tuple: (indices of kept segments, their lengths, their angles in degrees)
+    """
+    n = segments.shape[0]
+    kept = np.empty(n, dtype=np.int64)
+    lengths = np.empty(n)
+    angles = np.empty(n)
+    
+    count = 0
+    for i in range(n):
+        dx = float(segments[i, 2] - segments[i, 0])
+        dy = float(segments[i, 3] - segments[i, 1])
+        length = np.sqrt(dx * dx + dy * dy)
+        
+        if min_length < length < max_length:
+            kept[count] = i
+            lengths[count] = length
+            angles[count] = np.arctan2(dy, dx) * 180 / np.pi
+            count += 1
+    
+    return kept[:count], lengths[:count], angles[:count]
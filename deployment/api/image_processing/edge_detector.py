@@ -1,6 +1,12 @@
 import cv2
 import numpy as np
 from skimage import feature, measure, morphology
+from ._kernels import NUMBA_AVAILABLE, filter_door_lines
+from .elements import Walls, Windows
+
+# Structuring elements for the morphological operations, allocated once
+_KERNEL_3X3 = np.ones((3, 3), np.uint8)
+_KERNEL_5X5 = np.ones((5, 5), np.uint8)
 
 class EdgeDetector:
     """
@@ -62,8 +68,7 @@ class EdgeDetector:
         )
         
         # Remove small noise with morphological operations
-        kernel = np.ones((3, 3), np.uint8)
-        opening = cv2.morphologyEx(thresh, cv2.MORPH_OPEN, kernel, iterations=1)
+        opening = cv2.morphologyEx(thresh, cv2.MORPH_OPEN, _KERNEL_3X3, iterations=1)
         
         return opening
     
@@ -133,32 +138,28 @@ class EdgeDetector:
             maxLineGap=max_line_gap
         )
         
-        # Create an image with the detected lines
-        line_image = np.zeros_like(image)
-        
-        if lines is not None:
-            for line in lines:
-                x1, y1, x2, y2 = line[0]
-                cv2.line(line_image, (x1, y1), (x2, y2), 255, 2)
-        
         return edges, lines
     
-    def detect_architectural_elements(self, image, element_type='all'):
+    def detect_architectural_elements(self, image, element_type='all', gray=None):
         """
         Detect specific architectural elements in building plans.
         
         Args:
             image: Input image (numpy array)
             element_type (str): Type of element to detect ('walls', 'windows', 'doors', or 'all')
+            gray: Optional grayscale version of the image, if the caller
+                already has one, to skip the conversion
             
         Returns:
-            dict: Detected elements
+            dict: Detected elements; walls and windows are returned as Walls
+                and Windows containers, doors as a list of dictionaries
         """
         # Convert to grayscale if needed
-        if len(image.shape) == 3:
-            gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
-        else:
-            gray = image
+        if gray is None:
+            if len(image.shape) == 3:
+                gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+            else:
+                gray = image
             
         # Preprocess the image
         preprocessed = self._preprocess_image(gray)
@@ -194,34 +195,32 @@ class EdgeDetector:
             original: Original preprocessed image
             
         Returns:
-            list: Detected wall lines
+            Walls: Detected wall lines
         """
         # Apply morphological operations to enhance wall lines
-        kernel = np.ones((5, 5), np.uint8)
-        dilated = cv2.dilate(edges, kernel, iterations=1)
+        dilated = cv2.dilate(edges, _KERNEL_5X5, iterations=1)
         
         # Apply Hough Line Transform to detect straight lines
         _, lines = self._hough_line_detection(
             dilated, threshold=50, min_line_length=50, max_line_gap=10
         )
         
-        walls = []
-        if lines is not None:
-            for line in lines:
-                x1, y1, x2, y2 = line[0]
-                
-                # Calculate line length
-                length = np.sqrt((x2 - x1)**2 + (y2 - y1)**2)
-                
-                # Filter out short lines
-                if length > 50:
-                    walls.append({
-                        'type': 'wall',
-                        'points': [(x1, y1), (x2, y2)],
-                        'length': length
-                    })
-        
-        return walls
+        if lines is None:
+            lines = np.empty((0, 1, 4), dtype=np.int32)
+        
+        # Calculate all line lengths at once
+        segments = lines.reshape(-1, 4)
+        length = np.sqrt((segments[:, 2] - segments[:, 0])**2 + (segments[:, 3] - segments[:, 1])**2)
+        
+        # Filter out short lines
+        keep = length > 50
+        segments = segments[keep]
+        
+        return Walls(
+            p1=np.ascontiguousarray(segments[:, :2]),
+            p2=np.ascontiguousarray(segments[:, 2:]),
+            length=length[keep]
+        )
     
     def _detect_windows(self, edges, original):
         """
@@ -232,17 +231,16 @@ class EdgeDetector:
             original: Original preprocessed image
             
         Returns:
-            list: Detected window rectangles
+            Windows: Detected window rectangles
         """
         # Windows are often represented as rectangles with thin lines
         # Apply morphological operations to isolate potential window patterns
-        kernel = np.ones((3, 3), np.uint8)
-        eroded = cv2.erode(edges, kernel, iterations=1)
+        eroded = cv2.erode(edges, _KERNEL_3X3, iterations=1)
         
         # Find contours
         contours = cv2.findContours(eroded, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)[0]
         
-        windows = []
+        rects = []
         for contour in contours:
             # Approximate the contour to a polygon
             epsilon = 0.02 * cv2.arcLength(contour, True)
@@ -255,14 +253,19 @@ class EdgeDetector:
                 # Filter based on aspect ratio and size
                 aspect_ratio = float(w) / h
                 if 0.5 < aspect_ratio < 4 and 20 < w < 200 and 20 < h < 200:
-                    windows.append({
-                        'type': 'window',
-                        'points': [(x, y), (x+w, y), (x+w, y+h), (x, y+h)],
-                        'width': w,
-                        'height': h
-                    })
-        
-        return windows
+                    rects.append((x, y, w, h))
+        
+        # Build corner points for all windows at once
+        rects = np.array(rects, dtype=np.int32).reshape(-1, 4)
+        x, y, w, h = rects.T
+        points = np.stack([
+            np.stack([x, y], axis=1),
+            np.stack([x + w, y], axis=1),
+            np.stack([x + w, y + h], axis=1),
+            np.stack([x, y + h], axis=1)
+        ], axis=1)
+        
+        return Windows(points=points, width=w.copy(), height=h.copy())
     
     def _detect_doors(self, edges, original):
         """
@@ -301,23 +304,34 @@ class EdgeDetector:
         )
         
         if lines is not None:
-            for line in lines:
-                x1, y1, x2, y2 = line[0]
-                
-                # Calculate line length
-                length = np.sqrt((x2 - x1)**2 + (y2 - y1)**2)
-                
-                # Filter for potential door lines (typically shorter than walls)
-                if 30 < length < 100:
-                    # Check if there's a perpendicular line nearby (door frame)
-                    angle = np.arctan2(y2 - y1, x2 - x1) * 180 / np.pi
-                    
-                    # Add as potential door
-                    doors.append({
-                        'type': 'door_line',
-                        'points': [(x1, y1), (x2, y2)],
-                        'length': length,
-                        'angle': angle
-                    })
+            # Filter for potential door lines (typically shorter than walls)
+            # and compute their lengths and angles
+            segments = lines.reshape(-1, 4)
+            if NUMBA_AVAILABLE:
+                # One compiled pass over the segments
+                kept, length, angle = filter_door_lines(segments, 30, 100)
+                segments = segments[kept]
+            else:
+                # Without numba the kernel is a Python loop, so stay vectorized
+                dx = segments[:, 2] - segments[:, 0]
+                dy = segments[:, 3] - segments[:, 1]
+                length = np.sqrt(dx**2 + dy**2)
+                keep = (30 < length) & (length < 100)
+                segments = segments[keep]
+                length = length[keep]
+                angle = np.arctan2(dy[keep], dx[keep]) * 180 / np.pi
+            
+            # Add as potential doors
+            doors.extend(
+                {
+                    'type': 'door_line',
+                    'points': [(x1, y1), (x2, y2)],
+                    'length': line_length,
+                    'angle': line_angle
+                }
+                for (x1, y1, x2, y2), line_length, line_angle in zip(
+                    segments.tolist(), length.tolist(), angle.tolist()
+                )
+            )
         
         return doors
@@ -0,0 +1,135 @@
+from dataclasses import dataclass
+import numpy as np
+
+@dataclass
+class Walls:
+    """
+    Detected wall segments stored as parallel arrays.
+    
+    Attributes:
+        p1: Start points, array of shape (N, 2); int32 when detected
+        p2: End points, array of shape (N, 2); int32 when detected
+        length: Segment lengths, float64 array of shape (N,)
+    """
+    p1: np.ndarray
+    p2: np.ndarray
+    length: np.ndarray
+    
+    def __len__(self):
+        return len(self.length)
+    
+    @property
+    def endpoints(self):
+        """numpy array: Endpoints of every wall, shape (N, 2, 2)."""
+        return np.stack([self.p1, self.p2], axis=1)
+    
+    @classmethod
+    def from_dicts(cls, walls):
+        """
+        Build a Walls container from a list of wall dictionaries.
+        
+        Coordinates keep their input type, so float points are not truncated.
+        
+        Args:
+            walls: List of dicts with 'points' [(x1, y1), (x2, y2)] and 'length'
+        
+        Returns:
+            Walls: Wall container
+        """
+        points = np.array([wall['points'] for wall in walls]).reshape(-1, 2, 2)
+        length = np.array([wall['length'] for wall in walls], dtype=np.float64)
+        return cls(p1=points[:, 0], p2=points[:, 1], length=length)
+    
+    def to_dicts(self):
+        """
+        Convert to the list-of-dictionaries format used in results.
+        
+        Returns:
+            list: Wall dictionaries
+        """
+        return [
+            {
+                'type': 'wall',
+                'points': [tuple(p1), tuple(p2)],
+                'length': length
+            }
+            for p1, p2, length in zip(self.p1.tolist(), self.p2.tolist(), self.length.tolist())
+        ]
+
+@dataclass
+class Windows:
+    """
+    Detected window rectangles stored as parallel arrays.
+    
+    Attributes:
+        points: Corner points, array of shape (N, 4, 2); int32 when detected
+        width: Widths in pixels, array of shape (N,); int32 when detected
+        height: Heights in pixels, array of shape (N,); int32 when detected
+    """
+    points: np.ndarray
+    width: np.ndarray
+    height: np.ndarray
+    
+    def __len__(self):
+        return len(self.width)
+    
+    @classmethod
+    def from_dicts(cls, windows):
+        """
+        Build a Windows container from a list of window dictionaries.
+        
+        Values keep their input type, so float sizes are not truncated.
+        
+        Args:
+            windows: List of dicts with 'points', 'width' and 'height'
+        
+        Returns:
+            Windows: Window container
+        """
+        points = np.array([window['points'] for window in windows]).reshape(-1, 4, 2)
+        width = np.array([window['width'] for window in windows])
+        height = np.array([window['height'] for window in windows])
+        return cls(points=points, width=width, height=height)
+    
+    def to_dicts(self):
+        """
+        Convert to the list-of-dictionaries format used in results.
+        
+        Returns:
+            list: Window dictionaries
+        """
+        return [
+            {
+                'type': 'window',
+                'points': [tuple(point) for point in points],
+                'width': width,
+                'height': height
+            }
+            for points, width, height in zip(
+                self.points.tolist(), self.width.tolist(), self.height.tolist()
+            )
+        ]
+
+def as_walls(walls):
+    """
+    Return walls as a Walls container, converting from dictionaries if needed.
+    
+    Args:
+        walls: Walls container or list of wall dictionaries
+    
+    Returns:
+        Walls: Wall container
+    """
+    return walls if isinstance(walls, Walls) else Walls.from_dicts(walls)
+
+def as_windows(windows):
+    """
+    Return windows as a Windows container, converting from dictionaries if needed.
+    
+    Args:
+        windows: Windows container or list of window dictionaries
+    
+    Returns:
+        Windows: Window container
+    """
+    return windows if isinstance(windows, Windows) else Windows.from_dicts(windows)
@@ -1,6 +1,23 @@
+from concurrent.futures import ThreadPoolExecutor
 import numpy as np
 import cv2
-from skimage import measure, segmentation
+from scipy import ndimage
+from .elements import as_walls, as_windows
+
+# cv2.remap only accepts maps with fewer than SHRT_MAX rows
+REMAP_MAX_ROWS = 32000
+
+# Number of threads shared by all extractors for background room extraction
+MAX_WORKERS = 4
+
+# Rooms with a smaller area (in square pixels) are treated as noise
+MIN_ROOM_AREA = 1000
+
+# Structuring element used to close gaps between walls
+_CLOSE_KERNEL = cv2.getStructuringElement(cv2.MORPH_RECT, (5, 5))
+
+# Created once, so extract_features does not start threads on every call
+_executor = ThreadPoolExecutor(max_workers=MAX_WORKERS)
 
 class FeatureExtractor:
     """
@@ -32,25 +49,26 @@ class FeatureExtractor:
         if detected_elements is None:
             from image_processing.edge_detector import EdgeDetector
             edge_detector = EdgeDetector()
-            detected_elements = edge_detector.detect_architectural_elements(gray)
+            detected_elements = edge_detector.detect_architectural_elements(image, gray=gray)
         
-        # Extract features for each element type
-        features = {}
+        # Extract room boundaries in the background. Its morphology, distance
+        # transform, watershed and contour tracing run in OpenCV, which
+        # releases the GIL, so it overlaps with the element processing below
+        rooms = _executor.submit(self._extract_rooms, gray, detected_elements)
         
-        # Process walls
-        if 'walls' in detected_elements:
-            features['walls'] = self._process_walls(detected_elements['walls'], gray)
-            
-        # Process windows
-        if 'windows' in detected_elements:
-            features['windows'] = self._process_windows(detected_elements['windows'], gray)
-            
-        # Process doors
-        if 'doors' in detected_elements:
-            features['doors'] = self._process_doors(detected_elements['doors'], gray)
-            
-        # Extract room boundaries
-        features['rooms'] = self._extract_rooms(gray, detected_elements)
+        # Element processors, run in this thread
+        processors = {
+            'walls': self._process_walls,
+            'windows': self._process_windows,
+            'doors': self._process_doors
+        }
+        
+        features = {
+            key: process(detected_elements[key], gray)
+            for key, process in processors.items()
+            if key in detected_elements
+        }
+        features['rooms'] = rooms.result()
         
         return features
     
@@ -59,170 +77,163 @@ class FeatureExtractor:
         Process detected walls to extract additional features.
         
         Args:
-            walls: List of detected wall lines
+            walls: Detected wall lines (Walls container or list of dicts)
             image: Grayscale image
             
         Returns:
             list: Processed wall features
         """
-        processed_walls = []
+        walls = as_walls(walls)
+        if len(walls) == 0:
+            return []
+        
+        # Wall endpoints as an (N, 2, 2) array
+        endpoints = walls.endpoints.astype(np.float64)
+        
+        # Calculate all wall thicknesses in one batched profile extraction
+        thicknesses = self._estimate_wall_thicknesses(image, endpoints)
+        
+        # Calculate wall orientations (angles in degrees) for all walls at once
+        direction = endpoints[:, 1] - endpoints[:, 0]
+        angles = np.degrees(np.arctan2(direction[:, 1], direction[:, 0])) % 180
+        
+        # Determine if each wall is horizontal, vertical, or diagonal
+        orientations = np.select(
+            [(angles >= 45) & (angles < 135), (angles < 45) | (angles >= 135)],
+            ['diagonal', 'horizontal'],
+            default='vertical'
+        )
+        
+        # Create enhanced wall features
+        processed_walls = walls.to_dicts()
+        for wall, thickness, angle, orientation in zip(
+            processed_walls, thicknesses.tolist(), angles.tolist(), orientations.tolist()
+        ):
+            wall['thickness'] = thickness
+            wall['angle'] = angle
+            wall['orientation'] = orientation
         
-        for wall in walls:
-            # Get wall points
-            points = wall['points']
-            p1, p2 = points
-            
-            # Calculate wall thickness by analyzing perpendicular profile
-            thickness = self._estimate_wall_thickness(image, p1, p2)
-            
-            # Calculate wall orientation (angle in degrees)
-            dx = p2[0] - p1[0]
-            dy = p2[1] - p1[1]
-            angle = np.degrees(np.arctan2(dy, dx)) % 180
-            
-            # Determine if wall is horizontal, vertical, or diagonal
-            orientation = 'horizontal' if 0 <= angle < 45 or 135 <= angle < 180 else 'vertical'
-            if 45 <= angle < 135:
-                orientation = 'diagonal'
-                
-            # Create enhanced wall feature
-            enhanced_wall = {
-                'type': 'wall',
-                'points': points,
-                'length': wall['length'],
-                'thickness': thickness,
-                'angle': angle,
-                'orientation': orientation
-            }
-            
-            processed_walls.append(enhanced_wall)
-            
         return processed_walls
     
-    def _estimate_wall_thickness(self, image, p1, p2, sample_points=5):
+    def _estimate_wall_thicknesses(self, image, wall_points, sample_points=5, max_dist=20):
         """
-        Estimate wall thickness by analyzing perpendicular profiles.
+        Estimate the thickness of many walls at once.
+        
+        Each wall is sampled at evenly spaced points, and at every sample the
+        thickness is the distance between the first and last dark/light
+        transitions along a perpendicular profile. All profiles are gathered
+        with a single cv2.remap call and reduced with vectorized NumPy
+        operations.
         
         Args:
             image: Grayscale image
-            p1, p2: Wall endpoints
-            sample_points: Number of points to sample along the wall
+            wall_points: List of wall endpoint pairs [(x1, y1), (x2, y2)]
+            sample_points: Number of points to sample along each wall
+            max_dist: Maximum distance to check on either side of a wall
             
         Returns:
-            float: Estimated wall thickness in pixels
+            numpy array: Estimated wall thickness in pixels, one per wall
         """
-        # Calculate wall direction vector
-        dx = p2[0] - p1[0]
-        dy = p2[1] - p1[1]
-        length = np.sqrt(dx*dx + dy*dy)
-        
-        if length == 0:
-            return 1.0  # Default thickness for point
-            
-        # Normalize direction vector
-        dx /= length
-        dy /= length
-        
-        # Calculate perpendicular direction
-        perp_dx = -dy
-        perp_dy = dx
-        
-        thicknesses = []
-        
-        # Sample points along the wall
-        for i in range(sample_points):
-            # Calculate sample point
-            t = i / (sample_points - 1) if sample_points > 1 else 0.5
-            sample_x = int(p1[0] + t * (p2[0] - p1[0]))
-            sample_y = int(p1[1] + t * (p2[1] - p1[1]))
+        if len(wall_points) == 0:
+            return np.empty(0)
             
-            # Skip if out of bounds
-            if (sample_x < 0 or sample_x >= image.shape[1] or 
-                sample_y < 0 or sample_y >= image.shape[0]):
-                continue
-                
-            # Sample perpendicular profile
-            profile = []
-            max_dist = 20  # Maximum distance to check
-            
-            for d in range(-max_dist, max_dist + 1):
-                x = int(sample_x + d * perp_dx)
-                y = int(sample_y + d * perp_dy)
-                
-                # Skip if out of bounds
-                if (x < 0 or x >= image.shape[1] or 
-                    y < 0 or y >= image.shape[0]):
-                    continue
-                    
-                profile.append(image[y, x])
-                
-            # Estimate thickness from profile
-            if profile:
-                # Convert to numpy array
-                profile = np.array(profile)
-                
-                # Threshold profile
-                threshold = 128
-                binary_profile = (profile < threshold).astype(np.uint8) * 255
-                
-                # Find transitions
-                transitions = np.diff(binary_profile)
-                transition_indices = np.where(transitions != 0)[0]
-                
-                if len(transition_indices) >= 2:
-                    # Estimate thickness as distance between first and last transition
-                    thickness = transition_indices[-1] - transition_indices[0]
-                    thicknesses.append(thickness)
+        height, width = image.shape[:2]
+        
+        # Wall endpoints and direction vectors, shape (N, 2)
+        endpoints = np.asarray(wall_points, dtype=np.float64).reshape(-1, 2, 2)
+        p1 = endpoints[:, 0]
+        direction = endpoints[:, 1] - p1
+        length = np.sqrt((direction ** 2).sum(axis=1))
+        degenerate = length == 0
+        
+        # Unit perpendicular of each wall, shape (N, 2)
+        safe_length = np.where(degenerate, 1.0, length)
+        perp = np.stack([-direction[:, 1], direction[:, 0]], axis=1) / safe_length[:, None]
+        
+        # Sample points along each wall, shape (N, S, 2)
+        if sample_points > 1:
+            t = np.arange(sample_points) / (sample_points - 1)
+        else:
+            t = np.full(sample_points, 0.5)
+        samples = np.trunc(p1[:, None, :] + t[None, :, None] * direction[:, None, :])
+        sample_valid = (
+            (samples[..., 0] >= 0) & (samples[..., 0] < width) &
+            (samples[..., 1] >= 0) & (samples[..., 1] < height)
+        )
+        
+        # Perpendicular profile coordinates, shape (N, S, D)
+        offsets = np.arange(-max_dist, max_dist + 1)
+        xs = np.trunc(samples[..., 0, None] + offsets * perp[:, None, 0, None])
+        ys = np.trunc(samples[..., 1, None] + offsets * perp[:, None, 1, None])
+        valid = (xs >= 0) & (xs < width) & (ys >= 0) & (ys < height)
+        
+        # Gather every profile pixel with one remap call; remap limits the
+        # number of rows, so very large wall sets are gathered in chunks
+        map_x = xs.reshape(len(endpoints), -1).astype(np.float32)
+        map_y = ys.reshape(len(endpoints), -1).astype(np.float32)
+        profiles = np.empty(map_x.shape, dtype=image.dtype)
+        for start in range(0, len(map_x), REMAP_MAX_ROWS):
+            stop = start + REMAP_MAX_ROWS
+            profiles[start:stop] = cv2.remap(
+                image, map_x[start:stop], map_y[start:stop], cv2.INTER_NEAREST,
+                borderMode=cv2.BORDER_CONSTANT, borderValue=255
+            )
+        profiles = profiles.reshape(xs.shape)
+        
+        # Transitions between neighbouring in-bounds pixels; in-bounds pixels
+        # form a contiguous run so these indices match the compacted profile
+        dark = profiles < 128
+        transitions = (dark[..., 1:] != dark[..., :-1]) & valid[..., 1:] & valid[..., :-1]
+        first = np.argmax(transitions, axis=-1)
+        last = transitions.shape[-1] - 1 - np.argmax(transitions[..., ::-1], axis=-1)
+        measured = sample_valid & transitions.any(axis=-1) & (last > first)
+        
+        # Average thickness over the samples that produced a measurement
+        counts = measured.sum(axis=1)
+        totals = np.where(measured, last - first, 0).sum(axis=1)
+        thicknesses = np.ones(len(endpoints))
+        has_measurement = (counts > 0) & ~degenerate
+        thicknesses[has_measurement] = totals[has_measurement] / counts[has_measurement]
         
-        # Return average thickness
-        return np.mean(thicknesses) if thicknesses else 1.0
+        return thicknesses
     
     def _process_windows(self, windows, image):
         """
         Process detected windows to extract additional features.
         
         Args:
-            windows: List of detected window rectangles
+            windows: Detected window rectangles (Windows container or list of dicts)
             image: Grayscale image
             
         Returns:
             list: Processed window features
         """
-        processed_windows = []
+        windows = as_windows(windows)
         
-        for window in windows:
-            # Get window points
-            points = window['points']
-            
-            # Calculate window area
-            width = window['width']
-            height = window['height']
-            area = width * height
-            
-            # Calculate aspect ratio
-            aspect_ratio = width / height if height > 0 else 0
-            
-            # Determine window type based on aspect ratio and size
-            window_type = 'standard'
-            if aspect_ratio > 2:
-                window_type = 'horizontal'
-            elif aspect_ratio < 0.5:
-                window_type = 'vertical'
-            elif area > 10000:  # Large window
-                window_type = 'picture'
-                
-            # Create enhanced window feature
-            enhanced_window = {
-                'type': 'window',
-                'points': points,
-                'width': width,
-                'height': height,
-                'area': area,
-                'aspect_ratio': aspect_ratio,
-                'window_type': window_type
-            }
-            
-            processed_windows.append(enhanced_window)
+        # Calculate window areas and aspect ratios for all windows at once
+        # Widen integer sizes so the area cannot overflow; float sizes stay as they are
+        width = windows.width.astype(np.promote_types(windows.width.dtype, np.int64))
+        height = windows.height.astype(np.promote_types(windows.height.dtype, np.int64))
+        area = width * height
+        aspect_ratio = np.divide(
+            width, height, out=np.zeros(len(windows)), where=height > 0
+        )
+        
+        # Determine window type based on aspect ratio and size
+        window_types = np.select(
+            [aspect_ratio > 2, aspect_ratio < 0.5, area > 10000],
+            ['horizontal', 'vertical', 'picture'],
+            default='standard'
+        )
+        
+        # Create enhanced window features
+        processed_windows = windows.to_dicts()
+        for window, window_area, ratio, window_type in zip(
+            processed_windows, area.tolist(), aspect_ratio.tolist(), window_types.tolist()
+        ):
+            window['area'] = window_area
+            window['aspect_ratio'] = ratio
+            window['window_type'] = window_type
             
         return processed_windows
     
@@ -296,62 +307,88 @@ class FeatureExtractor:
         # Create a binary image highlighting walls
         binary = np.zeros_like(image)
         
-        # Draw walls
+        # Draw all walls with a single polylines call
         if 'walls' in detected_elements:
-            for wall in detected_elements['walls']:
-                p1, p2 = wall['points']
-                cv2.line(binary, p1, p2, 255, 2)
+            walls = as_walls(detected_elements['walls'])
+            if len(walls) > 0:
+                cv2.polylines(binary, list(walls.endpoints.astype(np.int32)), False, 255, 2)
         
         # Apply morphological operations to close gaps
-        kernel = np.ones((5, 5), np.uint8)
-        closed = cv2.morphologyEx(binary, cv2.MORPH_CLOSE, kernel)
+        closed = np.empty_like(binary)
+        cv2.morphologyEx(binary, cv2.MORPH_CLOSE, _CLOSE_KERNEL, dst=closed)
         
-        # Invert the image (rooms are now black)
-        inverted = cv2.bitwise_not(closed)
+        # Invert the image (rooms are now black), reusing the wall buffer
+        inverted = cv2.bitwise_not(closed, dst=binary)
         
         # Apply watershed segmentation to find rooms
         distance = cv2.distanceTransform(inverted, cv2.DIST_L2, 5)
-        _, markers = cv2.connectedComponents(np.uint8(distance > 0.5 * distance.max()))
+        _, max_distance, _, _ = cv2.minMaxLoc(distance)
         
-        # Apply watershed
-        markers = markers + 1
+        # Threshold the distance map straight into the now unused buffer
+        foreground = cv2.compare(distance, 0.5 * max_distance, cv2.CMP_GT, dst=inverted)
+        _, markers = cv2.connectedComponents(foreground)
+        
+        # Flood the markers over the wall image with OpenCV's watershed, which
+        # labels the markers array in place and marks boundaries with -1
+        markers += 1
         markers[closed > 0] = 0
-        segmented = segmentation.watershed(-distance, markers)
+        cv2.watershed(cv2.cvtColor(closed, cv2.COLOR_GRAY2BGR), markers)
+        markers[markers < 0] = 0
+        segmented = markers
+        
+        # Count the pixels of every label in a single pass. A room's contour
+        # never encloses more area than its pixel count, so only labels that
+        # are present with at least the minimum room area are visited
+        pixel_areas = np.bincount(segmented.ravel())
+        labels = np.flatnonzero(pixel_areas >= MIN_ROOM_AREA)
+        labels = labels[labels >= 2]
+        
+        # Bounding box of every label, so each room is traced on a small crop
+        bounding_boxes = ndimage.find_objects(segmented)
         
-        # Extract room contours
+        # Extract room contours, with the functions used for every label
+        # bound to locals once instead of looked up on each iteration
         rooms = []
+        find_contours = cv2.findContours
+        contour_area = cv2.contourArea
+        moments = cv2.moments
         
-        for label in range(2, np.max(segmented) + 1):
-            # Create mask for this room
-            room_mask = np.zeros_like(image, dtype=np.uint8)
-            room_mask[segmented == label] = 255
+        for label in labels.tolist():
+            # Create mask for this room within its bounding box
+            rows, cols = bounding_boxes[label - 1]
+            room_mask = (segmented[rows, cols] == label).view(np.uint8)
             
-            # Find contours
-            contours = measure.find_contours(room_mask, 0.5)
+            # Find the outer contours of the room in image coordinates
+            contours, _ = find_contours(
+                room_mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE,
+                offset=(cols.start, rows.start)
+            )
             
             if contours:
-                # Get the largest contour
-                largest_contour = max(contours, key=len)
-                
-                # Convert to the format we need
-                points = [(int(x), int(y)) for y, x in largest_contour]
-                
-                # Calculate area
-                area = cv2.contourArea(np.array(points).reshape(-1, 1, 2))
+                # Get the largest contour, computing each area only once
+                areas = [contour_area(contour) for contour in contours]
+                largest = int(np.argmax(areas))
+                contour = contours[largest]
+                area = areas[largest]
                 
                 # Skip very small areas (likely noise)
-                if area < 1000:
+                if area < MIN_ROOM_AREA:
                     continue
                     
                 # Calculate centroid
-                M = cv2.moments(np.array(points).reshape(-1, 1, 2))
-                if M["m00"] != 0:
-                    cx = int(M["m10"] / M["m00"])
-                    cy = int(M["m01"] / M["m00"])
+                M = moments(contour)
+                m00 = M["m00"]
+                if m00 != 0:
+                    cx = int(M["m10"] / m00)
+                    cy = int(M["m01"] / m00)
                     centroid = (cx, cy)
                 else:
                     centroid = (0, 0)
                 
+                # Convert to [x, y] lists only once the room is kept, without
+                # building an extra tuple per vertex
+                points = contour.reshape(-1, 2).tolist()
+                
                 # Create room feature
                 room = {
                     'type': 'room',
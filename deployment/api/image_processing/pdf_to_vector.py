@@ -1,8 +1,16 @@
 import os
+import json
 import fitz  # PyMuPDF
 import numpy as np
 import cv2
-from skimage import measure
+from .utils import convert_for_json
+
+# Prefer orjson for writing vector files, fall back to the standard library
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
 
 class PDFToVectorConverter:
     """
@@ -28,14 +36,17 @@ class PDFToVectorConverter:
         if not os.path.exists(pdf_path):
             raise FileNotFoundError(f"PDF file not found: {pdf_path}")
             
-        if output_dir and not os.path.exists(output_dir):
-            os.makedirs(output_dir)
+        if output_dir:
+            os.makedirs(output_dir, exist_ok=True)
             
         # Open the PDF file
         doc = fitz.open(pdf_path)
         
         result = {}
         
+        # Output files are named after the PDF, so resolve its name only once
+        pdf_name = os.path.basename(pdf_path)
+        
         # Process each page
         for page_num, page in enumerate(doc):
             page_vectors = self._process_page(page, page_num)
@@ -43,7 +54,7 @@ class PDFToVectorConverter:
             
             # Save to file if output_dir is provided
             if output_dir:
-                output_path = os.path.join(output_dir, f"{os.path.basename(pdf_path)}_page_{page_num}.json")
+                output_path = os.path.join(output_dir, f"{pdf_name}_page_{page_num}.json")
                 self._save_vectors_to_file(page_vectors, output_path)
                 
         return result
@@ -114,41 +125,40 @@ class PDFToVectorConverter:
         Returns:
             list: List of detected contours as paths
         """
-        # Render page to an image
-        pix = page.get_pixmap(matrix=fitz.Matrix(2, 2))
-        img = np.frombuffer(pix.samples, dtype=np.uint8).reshape(pix.height, pix.width, pix.n)
-        
-        # Convert to grayscale if needed
-        if pix.n == 4:  # RGBA
-            gray = cv2.cvtColor(img, cv2.COLOR_RGBA2GRAY)
-        elif pix.n == 3:  # RGB
-            gray = cv2.cvtColor(img, cv2.COLOR_RGB2GRAY)
-        else:
-            gray = img
-            
+        # Render page straight to a grayscale image, rather than rendering
+        # RGB and converting it in a second pass
+        pix = page.get_pixmap(matrix=fitz.Matrix(2, 2), colorspace=fitz.csGRAY, alpha=False)
+        gray = np.frombuffer(pix.samples, dtype=np.uint8).reshape(pix.height, pix.stride)[:, :pix.width]
+        
         # Apply edge detection
         edges = cv2.Canny(gray, 50, 150)
         
         # Find contours
-        contours = measure.find_contours(edges, 0.5)
+        return self._trace_contours(edges)
+    
+    def _trace_contours(self, edges):
+        """
+        Trace all contours of an edge image as paths.
         
-        paths = []
-        for contour in contours:
-            # Convert to the format we need
-            points = [(float(x), float(y)) for y, x in contour]
+        Args:
+            edges: Binary edge image
             
-            # Skip very small contours (likely noise)
-            if len(points) < 5:
-                continue
-                
-            path = {
+        Returns:
+            list: List of contour path dictionaries
+        """
+        contours, _ = cv2.findContours(edges, cv2.RETR_LIST, cv2.CHAIN_APPROX_TC89_KCOS)
+        
+        # Skip very small contours (likely noise); contours traced by
+        # OpenCV are closed by construction
+        return [
+            {
                 "type": "contour",
-                "points": points,
-                "closed": np.allclose(points[0], points[-1])
+                "points": contour.reshape(-1, 2).tolist(),
+                "closed": True
             }
-            paths.append(path)
-            
-        return paths
+            for contour in contours
+            if len(contour) >= 5
+        ]
     
     def _save_vectors_to_file(self, vectors, output_path):
         """
@@ -158,18 +168,12 @@ class PDFToVectorConverter:
             vectors (dict): Vector data
             output_path (str): Path to save the JSON file
         """
-        import json
-        
-        # Convert numpy arrays to lists for JSON serialization
-        def convert_for_json(obj):
-            if isinstance(obj, np.ndarray):
-                return obj.tolist()
-            elif isinstance(obj, dict):
-                return {k: convert_for_json(v) for k, v in obj.items()}
-            elif isinstance(obj, list):
-                return [convert_for_json(i) for i in obj]
-            else:
-                return obj
+        # orjson serializes numpy arrays natively and writes bytes in one call
+        if ORJSON_AVAILABLE:
+            data = orjson.dumps(vectors, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_INDENT_2)
+            with open(output_path, 'wb') as f:
+                f.write(data)
+            return
         
         json_data = convert_for_json(vectors)
         
@@ -190,42 +194,23 @@ class PDFToVectorConverter:
         if not os.path.exists(image_path):
             raise FileNotFoundError(f"Image file not found: {image_path}")
             
-        if output_dir and not os.path.exists(output_dir):
-            os.makedirs(output_dir)
+        if output_dir:
+            os.makedirs(output_dir, exist_ok=True)
             
-        # Read the image
-        img = cv2.imread(image_path)
-        if img is None:
+        # Read the image straight into grayscale, the only form used below
+        gray = cv2.imread(image_path, cv2.IMREAD_GRAYSCALE)
+        if gray is None:
             raise ValueError(f"Failed to read image: {image_path}")
-            
-        # Convert to grayscale
-        gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
         
         # Apply edge detection
         edges = cv2.Canny(gray, 50, 150)
         
         # Find contours
-        contours = measure.find_contours(edges, 0.5)
+        paths = self._trace_contours(edges)
         
-        paths = []
-        for contour in contours:
-            # Convert to the format we need
-            points = [(float(x), float(y)) for y, x in contour]
-            
-            # Skip very small contours (likely noise)
-            if len(points) < 5:
-                continue
-                
-            path = {
-                "type": "contour",
-                "points": points,
-                "closed": np.allclose(points[0], points[-1])
-            }
-            paths.append(path)
-            
         result = {
-            "width": img.shape[1],
-            "height": img.shape[0],
+            "width": gray.shape[1],
+            "height": gray.shape[0],
             "paths": paths
         }
         
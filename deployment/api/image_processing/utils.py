@@ -1,5 +1,8 @@
 import numpy as np
 
+# Types that are already JSON serializable and can be returned unchanged
+_JSON_PRIMITIVES = frozenset({str, int, float, bool, type(None)})
+
 def convert_for_json(obj):
     """
     Convert numpy types to Python native types for JSON serialization.
@@ -10,15 +13,25 @@ def convert_for_json(obj):
     Returns:
         JSON serializable object
     """
-    if isinstance(obj, np.ndarray):
+    # Check exact types first; almost every node is a primitive, dict or list
+    cls = obj.__class__
+    if cls in _JSON_PRIMITIVES:
+        return obj
+    elif cls is dict:
+        return {k: convert_for_json(v) for k, v in obj.items()}
+    elif cls is list or cls is tuple:
+        return [convert_for_json(i) for i in obj]
+    elif isinstance(obj, np.ndarray):
         return obj.tolist()
     elif isinstance(obj, np.integer):
         return int(obj)
     elif isinstance(obj, np.floating):
         return float(obj)
+    elif isinstance(obj, np.bool_):
+        return bool(obj)
     elif isinstance(obj, dict):
         return {k: convert_for_json(v) for k, v in obj.items()}
     elif isinstance(obj, list):
         return [convert_for_json(i) for i in obj]
     else:
-        return obj
\ No newline at end of file
+        return obj
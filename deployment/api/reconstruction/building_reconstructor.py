@@ -1,6 +1,8 @@
 import os
+from functools import lru_cache
 import numpy as np
 import trimesh
+from scipy.spatial import ConvexHull
 
 # Try to import open3d, but continue if not available
 try:
@@ -10,6 +12,41 @@ except ImportError:
     OPEN3D_AVAILABLE = False
     print("Warning: open3d not available, some 3D functionality may be limited")
 
+# Points closer than this are treated as the same outline point
+POINT_TOLERANCE = 1e-6
+
+# Number of distinct outlines whose hulls are kept
+HULL_CACHE_SIZE = 128
+
+# Triangles of a wall box with outward normals, for vertices ordered as the
+# four footprint corners counterclockwise followed by the four top corners
+_WALL_FACES = np.array([
+    [0, 2, 1], [0, 3, 2],
+    [4, 5, 6], [4, 6, 7],
+    [0, 1, 5], [0, 5, 4],
+    [1, 2, 6], [1, 6, 5],
+    [2, 3, 7], [2, 7, 6],
+    [3, 0, 4], [3, 4, 7]
+], dtype=np.int64)
+
+@lru_cache(maxsize=HULL_CACHE_SIZE)
+def _hull_indices(points_key):
+    """
+    Compute the convex hull of outline points, cached by point content.
+    
+    Args:
+        points_key: Bytes of a float64 (N, 2) point array
+        
+    Returns:
+        tuple: Indices of the hull vertices in counterclockwise order, or
+            None if the hull cannot be computed
+    """
+    points = np.frombuffer(points_key, dtype=np.float64).reshape(-1, 2)
+    try:
+        return tuple(ConvexHull(points).vertices.tolist())
+    except Exception:
+        return None
+
 class BuildingReconstructor:
     """
     Class for reconstructing 3D building models from processed floor plans and elevations.
@@ -32,8 +69,8 @@ class BuildingReconstructor:
             dict: 3D building model data
         """
         # Create output directory if needed
-        if output_dir and not os.path.exists(output_dir):
-            os.makedirs(output_dir)
+        if output_dir:
+            os.makedirs(output_dir, exist_ok=True)
             
         # Validate input data
         if not floor_plans:
@@ -44,6 +81,13 @@ class BuildingReconstructor:
         # Extract building outline from floor plans
         building_outline = self._extract_building_outline(floor_plans)
         
+        # The roof follows the top floor, which for a single floor is the
+        # outline already extracted
+        if len(floor_plans) == 1:
+            top_outline = building_outline
+        else:
+            top_outline = self._extract_building_outline([floor_plans[-1]])
+        
         # Extract floor heights from elevations
         floor_heights = self._extract_floor_heights(elevations)
         
@@ -53,8 +97,8 @@ class BuildingReconstructor:
         # Create openings (windows and doors) from floor plans and elevations
         openings = self._create_openings(floor_plans, elevations)
         
-        # Create roof from top floor plan and elevations
-        roof = self._create_roof(floor_plans[-1], elevations)
+        # Create roof from top floor outline and elevations
+        roof = self._create_roof(top_outline, elevations)
         
         # Combine all elements into a single 3D model
         building_model = {
@@ -70,8 +114,9 @@ class BuildingReconstructor:
         
         # Save mesh if output_dir is provided
         if output_dir:
-            mesh_path = os.path.join(output_dir, "building_model.obj")
-            mesh.export(mesh_path)
+            # Binary glTF avoids formatting every coordinate as text
+            mesh_path = os.path.join(output_dir, "building_model.glb")
+            mesh.export(mesh_path, file_type='glb')
             
         return {
             'building_model': building_model,
@@ -184,18 +229,24 @@ class BuildingReconstructor:
         # For now, we'll use a convex hull as a simple approximation
         try:
             # Convert to numpy array
-            points_array = np.array(points)
-            
-            # Use trimesh to compute convex hull
-            hull = trimesh.convex.convex_hull(points_array)
+            points_array = np.asarray(points)[:, :2]
             
-            # Extract vertices of the hull
-            hull_vertices = hull.vertices.tolist()
-            
-            return hull_vertices
+            # Drop repeated points, such as endpoints shared by adjacent walls,
+            # keeping the first occurrence of each
+            keys = np.round(points_array / POINT_TOLERANCE).astype(np.int64)
+            _, first = np.unique(keys, axis=0, return_index=True)
+            points_array = points_array[np.sort(first)]
         except Exception:
+            return []
+        
+        # Floors with identical outline points share one hull computation
+        hull = _hull_indices(points_array.astype(np.float64).tobytes())
+        if hull is None:
             # Fallback: return empty list if convex hull fails
             return []
+        
+        # Extract vertices of the hull
+        return points_array[list(hull)].tolist()
     
     def _extract_floor_heights(self, elevations):
         """
@@ -207,24 +258,23 @@ class BuildingReconstructor:
         Returns:
             list: Floor heights
         """
-        floor_heights = []
-        
         # Collect floor levels from all elevations
-        all_levels = []
-        for elevation in elevations:
-            elevation_data = elevation.get('elevation_data', {})
-            levels = elevation_data.get('floor_levels', [])
-            
-            for level in levels:
-                y_position = level.get('y_position', 0)
-                all_levels.append(y_position)
+        all_levels = np.fromiter(
+            (
+                level.get('y_position', 0)
+                for elevation in elevations
+                for level in elevation.get('elevation_data', {}).get('floor_levels', [])
+            ),
+            dtype=np.float64
+        )
         
         # Sort and remove duplicates
-        if all_levels:
+        if all_levels.size:
             # Sort in descending order (top to bottom)
-            all_levels.sort(reverse=True)
+            all_levels = np.sort(all_levels)[::-1].tolist()
             
-            # Remove duplicates (with tolerance)
+            # Remove duplicates (with tolerance). There are only a handful of
+            # levels, so a plain loop is cheapest
             unique_levels = [all_levels[0]]
             for level in all_levels[1:]:
                 # Check if this level is significantly different from the last one
@@ -257,18 +307,28 @@ class BuildingReconstructor:
             list: 3D wall data
         """
         walls_3d = []
+        if not floor_plans:
+            return walls_3d
+        
+        # Get the base height of every floor, floors without a level start at 0
+        num_floors = len(floor_plans)
+        levels = np.asarray(floor_heights, dtype=np.float64)
+        base_heights = np.zeros(num_floors)
+        known = min(num_floors, levels.size)
+        base_heights[:known] = levels[:known]
+        
+        # Each floor reaches the level listed before it, the first is 3m tall
+        top_heights = np.empty(num_floors)
+        top_heights[0] = base_heights[0] + 3.0
+        top_heights[1:] = levels[np.arange(num_floors - 1)]
+        
+        # Calculate wall heights
+        wall_heights = top_heights - base_heights
         
         # Process each floor
-        for i, floor_plan in enumerate(floor_plans):
-            # Get the height of this floor
-            floor_height = floor_heights[i] if i < len(floor_heights) else 0
-            
-            # Get the height of the next floor (or roof)
-            next_height = floor_heights[i-1] if i > 0 else (floor_height + 3.0)  # Default to 3m height
-            
-            # Calculate wall height
-            wall_height = next_height - floor_height
-            
+        for floor_plan, floor_height, wall_height in zip(
+            floor_plans, base_heights.tolist(), wall_heights.tolist()
+        ):
             # Get walls from the floor plan
             walls = floor_plan['features'].get('walls', [])
             
@@ -306,34 +366,53 @@ class BuildingReconstructor:
             # Get windows from the floor plan
             windows = floor_plan['features'].get('windows', [])
             
-            # Create 3D windows
-            for window in windows:
-                points = window.get('points', [])
-                if len(points) >= 4:  # Need at least 4 points for a rectangle
-                    # Calculate window position and dimensions
-                    min_x = min(p[0] for p in points)
-                    min_y = min(p[1] for p in points)
-                    max_x = max(p[0] for p in points)
-                    max_y = max(p[1] for p in points)
-                    
-                    width = max_x - min_x
-                    height = max_y - min_y
-                    
-                    # Create 3D window
-                    window_3d = {
+            # Gather the windows with at least 4 points, enough for a rectangle
+            window_points = [
+                window.get('points', []) for window in windows
+                if len(window.get('points', [])) >= 4
+            ]
+            
+            # Create 3D windows, calculating every window's position and
+            # dimensions at once from the bounding box of its run of rows in
+            # the stacked point array
+            if window_points:
+                counts = [len(points) for points in window_points]
+                starts = np.cumsum([0] + counts[:-1])
+                stacked = np.array([point[:2] for points in window_points for point in points])
+                mins = np.minimum.reduceat(stacked, starts, axis=0)
+                sizes = np.maximum.reduceat(stacked, starts, axis=0) - mins
+                
+                openings_3d.extend(
+                    {
                         'type': 'window',
-                        'position': (min_x, min_y),
+                        'position': tuple(position),
                         'width': width,
                         'height': height,
                         'floor': i
                     }
-                    openings_3d.append(window_3d)
+                    for position, (width, height) in zip(mins.tolist(), sizes.tolist())
+                )
             
             # Get doors from the floor plan
             doors = floor_plan['features'].get('doors', [])
             
+            # Calculate the widths of all standard doors at once, stored at
+            # each door's index in the doors list
+            standard_doors = [
+                j for j, door in enumerate(doors)
+                if door.get('door_type') != 'swing' and len(door.get('points', [])) >= 2
+            ]
+            door_widths = np.zeros(len(doors))
+            if standard_doors:
+                door_ends = np.array(
+                    [[doors[j]['points'][0][:2], doors[j]['points'][1][:2]] for j in standard_doors],
+                    dtype=np.float64
+                )
+                door_widths[standard_doors] = np.hypot(*(door_ends[:, 1] - door_ends[:, 0]).T)
+            door_widths = door_widths.tolist()
+            
             # Create 3D doors
-            for door in doors:
+            for j, door in enumerate(doors):
                 if door.get('door_type') == 'swing':
                     # Swing door
                     center = door.get('center', (0, 0))
@@ -352,15 +431,15 @@ class BuildingReconstructor:
                     # Standard door
                     points = door.get('points', [])
                     if len(points) >= 2:
-                        # Calculate door position and dimensions
-                        p1, p2 = points[:2]
+                        # Door position is its first point
+                        p1 = points[0]
                         
                         # Create 3D door
                         door_3d = {
                             'type': 'door',
                             'door_type': 'standard',
                             'position': p1,
-                            'width': np.sqrt((p2[0] - p1[0])**2 + (p2[1] - p1[1])**2),
+                            'width': door_widths[j],
                             'height': 2.0,  # Default door height
                             'floor': i
                         }
@@ -374,55 +453,26 @@ class BuildingReconstructor:
         
         return openings_3d
     
-    def _create_roof(self, top_floor_plan, elevations):
+    def _create_roof(self, top_outline, elevations):
         """
-        Create 3D roof from top floor plan and elevations.
+        Create 3D roof from the top floor outline and elevations.
         
         Args:
-            top_floor_plan: Processed top floor plan data
+            top_outline: Building outline data of the top floor
             elevations: List of processed elevation data
             
         Returns:
             dict: 3D roof data
         """
-        # Extract building outline from top floor
-        outline = self._extract_building_outline([top_floor_plan])
-        exterior_walls = outline.get('exterior_walls', [])
-        
-        # Default roof type is flat
-        roof_type = 'flat'
-        roof_height = 0.5  # Default height for flat roof
-        
-        # Try to determine roof type from elevations
-        for elevation in elevations:
-            # This would analyze elevation views to determine roof type
-            # For simplicity, we'll use a flat roof in this implementation
-            pass
+        exterior_walls = top_outline.get('exterior_walls', [])
         
-        # Create roof based on type
-        if roof_type == 'flat':
-            roof = {
-                'type': 'flat',
-                'outline': exterior_walls,
-                'height': roof_height
-            }
-        elif roof_type == 'gabled':
-            # For a gabled roof, we would need to determine the ridge line
-            # For simplicity, we'll use a flat roof
-            roof = {
-                'type': 'flat',
-                'outline': exterior_walls,
-                'height': roof_height
-            }
-        else:
-            # Default to flat roof
-            roof = {
-                'type': 'flat',
-                'outline': exterior_walls,
-                'height': roof_height
-            }
-        
-        return roof
+        # Roof types are not yet determined from the elevations, so every
+        # building gets a flat roof with the default height
+        return {
+            'type': 'flat',
+            'outline': exterior_walls,
+            'height': 0.5
+        }
     
     def _generate_mesh(self, building_model):
         """
@@ -434,110 +484,104 @@ class BuildingReconstructor:
         Returns:
             trimesh.Trimesh: 3D mesh
         """
-        # Create an empty scene
-        scene = trimesh.Scene()
+        # Collect the meshes of all elements
+        meshes = []
         
         # Add walls
-        for wall in building_model['walls']:
-            wall_mesh = self._create_wall_mesh(wall)
-            if wall_mesh:
-                scene.add_geometry(wall_mesh)
+        wall_mesh = self._walls_to_mesh(building_model['walls'])
+        if wall_mesh:
+            meshes.append(wall_mesh)
         
         # Add openings (windows and doors)
         for opening in building_model['openings']:
             opening_mesh = self._create_opening_mesh(opening)
             if opening_mesh:
-                scene.add_geometry(opening_mesh)
+                meshes.append(opening_mesh)
         
         # Add roof
         roof_mesh = self._create_roof_mesh(building_model['roof'], building_model['floors'])
         if roof_mesh:
-            scene.add_geometry(roof_mesh)
+            meshes.append(roof_mesh)
+        
+        if not meshes:
+            return trimesh.Trimesh()
         
-        # Export as a single mesh
-        mesh = scene.dump(concatenate=True)
+        # Stack all vertices and faces directly, shifting each mesh's faces
+        # past the vertices of the meshes before it
+        vertex_counts = [len(m.vertices) for m in meshes]
+        offsets = np.cumsum([0] + vertex_counts[:-1])
+        vertices = np.vstack([m.vertices for m in meshes])
+        faces = np.vstack([m.faces + offset for m, offset in zip(meshes, offsets)])
         
-        return mesh
+        return trimesh.Trimesh(vertices=vertices, faces=faces, process=False)
     
-    def _create_wall_mesh(self, wall):
+    def _walls_to_mesh(self, walls):
         """
-        Create a mesh for a wall.
+        Create a single mesh for all walls.
+        
+        Every wall segment becomes a box running from one point to the next,
+        centered on the segment across its thickness. The boxes of all
+        segments are built at once with NumPy.
         
         Args:
-            wall: Wall data
+            walls: List of wall data
             
         Returns:
-            trimesh.Trimesh: Wall mesh
+            trimesh.Trimesh: Wall mesh, or None if there are no wall segments
         """
-        points = wall.get('points', [])
-        if len(points) < 2:
+        # Gather the segments of all walls with their per-wall dimensions
+        starts, ends, heights, base_heights, thicknesses = [], [], [], [], []
+        for wall in walls:
+            points = wall.get('points', [])
+            if len(points) < 2:
+                continue
+            
+            points = np.asarray(points, dtype=np.float64)[:, :2]
+            num_segments = len(points) - 1
+            starts.append(points[:-1])
+            ends.append(points[1:])
+            heights.append(np.full(num_segments, wall.get('height', 3.0), dtype=np.float64))
+            base_heights.append(np.full(num_segments, wall.get('base_height', 0.0), dtype=np.float64))
+            thicknesses.append(np.full(num_segments, wall.get('thickness', 0.2), dtype=np.float64))
+        
+        if not starts:
             return None
-            
-        height = wall.get('height', 3.0)
-        base_height = wall.get('base_height', 0.0)
-        thickness = wall.get('thickness', 0.2)
         
-        # Create a path for the wall
-        path = np.array(points)
+        starts = np.concatenate(starts)
+        ends = np.concatenate(ends)
+        heights = np.concatenate(heights)
+        base_heights = np.concatenate(base_heights)
+        thicknesses = np.concatenate(thicknesses)
+        
+        # Skip zero-length segments
+        direction = ends - starts
+        lengths = np.linalg.norm(direction, axis=1)
+        keep = lengths > 0
+        if not keep.any():
+            return None
         
-        # Create a rectangular cross-section
-        # The cross-section is perpendicular to the path
-        cross_section = np.array([
-            [-thickness/2, 0],
-            [thickness/2, 0],
-            [thickness/2, height],
-            [-thickness/2, height]
-        ])
+        starts, ends, direction, lengths = starts[keep], ends[keep], direction[keep], lengths[keep]
+        heights, base_heights, thicknesses = heights[keep], base_heights[keep], thicknesses[keep]
+        count = len(lengths)
         
-        try:
-            # Create the wall mesh by extruding the cross-section along the path
-            wall_mesh = trimesh.creation.extrude_polygon(
-                cross_section=cross_section,
-                polygon=path
-            )
-            
-            # Translate to the correct base height
-            wall_mesh.apply_translation([0, 0, base_height])
-            
-            return wall_mesh
-        except Exception:
-            # Fallback: create a box for each wall segment
-            meshes = []
-            
-            for i in range(len(points) - 1):
-                p1 = points[i]
-                p2 = points[i + 1]
-                
-                # Calculate wall length and direction
-                dx = p2[0] - p1[0]
-                dy = p2[1] - p1[1]
-                length = np.sqrt(dx*dx + dy*dy)
-                
-                if length > 0:
-                    # Create a box for this wall segment
-                    box = trimesh.creation.box(
-                        extents=[length, thickness, height]
-                    )
-                    
-                    # Rotate to align with wall direction
-                    angle = np.arctan2(dy, dx)
-                    rotation = trimesh.transformations.rotation_matrix(
-                        angle, [0, 0, 1]
-                    )
-                    box.apply_transform(rotation)
-                    
-                    # Translate to the correct position
-                    translation = [p1[0], p1[1], base_height]
-                    box.apply_translation(translation)
-                    
-                    meshes.append(box)
-            
-            if meshes:
-                # Combine all wall segment meshes
-                wall_mesh = trimesh.util.concatenate(meshes)
-                return wall_mesh
-            
-            return None
+        # Offset to either side of the segment, half the thickness along the
+        # left-hand normal
+        offset = np.stack([-direction[:, 1], direction[:, 0]], axis=1)
+        offset *= (thicknesses / (2 * lengths))[:, None]
+        
+        # Footprint corners counterclockwise, then the same corners on top
+        footprint = np.stack([starts - offset, ends - offset, ends + offset, starts + offset], axis=1)
+        vertices = np.empty((count, 8, 3))
+        vertices[:, :4, :2] = footprint
+        vertices[:, 4:, :2] = footprint
+        vertices[:, :4, 2] = base_heights[:, None]
+        vertices[:, 4:, 2] = (base_heights + heights)[:, None]
+        
+        faces = _WALL_FACES[None, :, :] + 8 * np.arange(count)[:, None, None]
+        
+        return trimesh.Trimesh(
+            vertices=vertices.reshape(-1, 3), faces=faces.reshape(-1, 3), process=False
+        )
     
     def _create_opening_mesh(self, opening):
         """
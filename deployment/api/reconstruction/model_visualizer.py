@@ -1,61 +1,156 @@
 import os
+import atexit
 import numpy as np
 import json
-import trimesh
-import open3d as o3d
+import mmap
+from functools import lru_cache
+
+# Prefer orjson for reading model files, fall back to the standard library
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# Unit box in the vertex and triangle order used by TriangleMesh.create_box
+_BOX_V = np.array([
+    [0, 0, 0], [1, 0, 0], [0, 0, 1], [1, 0, 1],
+    [0, 1, 0], [1, 1, 0], [0, 1, 1], [1, 1, 1]
+], dtype=np.float64)
+_BOX_F = np.array([
+    [4, 7, 5], [4, 6, 7], [0, 2, 4], [2, 6, 4],
+    [0, 1, 2], [1, 3, 2], [1, 5, 7], [1, 7, 3],
+    [2, 3, 7], [2, 7, 6], [0, 4, 1], [1, 4, 5]
+], dtype=np.int32)
+
+# Wall segments shorter than this are treated as duplicate points
+_MIN_SEGMENT_LENGTH = 1e-9
+
+def _open3d():
+    """
+    Import Open3D on first use, so importing this module stays cheap.
+    
+    Returns:
+        module: The open3d module
+    """
+    import open3d
+    return open3d
+
+@lru_cache(maxsize=None)
+def _cylinder_template(height):
+    """
+    Get the vertices and triangles of a unit-radius Open3D cylinder.
+    
+    Args:
+        height: Cylinder height
+        
+    Returns:
+        tuple: (vertices, triangles) arrays
+    """
+    o3d = _open3d()
+    cylinder = o3d.geometry.TriangleMesh.create_cylinder(radius=1.0, height=height)
+    return np.asarray(cylinder.vertices), np.asarray(cylinder.triangles)
+
+def _weld(vertices, triangles, colors=None, tol=1e-6):
+    """
+    Merge vertices that coincide within a tolerance.
+    
+    Args:
+        vertices: Vertex positions, array of shape (N, 3)
+        triangles: Vertex indices, array of shape (M, 3)
+        colors: Optional vertex colors, array of shape (N, 3)
+        tol: Grid size used to quantize positions
+        
+    Returns:
+        tuple: (vertices, triangles, colors) with duplicate vertices removed,
+            kept in order of first occurrence
+    """
+    keys = np.round(vertices / tol).astype(np.int64)
+    _, first, inverse = np.unique(keys, axis=0, return_index=True, return_inverse=True)
+    
+    # np.unique sorts the keys, so renumber the unique vertices in the order
+    # they first appear
+    order = np.argsort(first)
+    rank = np.empty_like(order)
+    rank[order] = np.arange(len(order))
+    keep = first[order]
+    
+    welded_colors = colors[keep] if colors is not None else None
+    return vertices[keep], rank[inverse.reshape(-1)][triangles], welded_colors
+
+@lru_cache(maxsize=None)
+def _compute_device():
+    """
+    Get the Open3D device used for mesh computations.
+    
+    Returns:
+        open3d.core.Device: First CUDA device if available, otherwise the CPU
+    """
+    o3d = _open3d()
+    return o3d.core.Device('CUDA:0') if o3d.core.cuda.is_available() else o3d.core.Device('CPU:0')
 
 class ModelVisualizer:
     """
     Class for visualizing 3D building models.
     """
     
+    # Hidden window shared by all headless renders
+    _offscreen_vis = None
+    
     def __init__(self):
         """Initialize the model visualizer."""
         pass
     
-    def visualize_model(self, model_data, output_dir=None):
+    @classmethod
+    def _get_offscreen_visualizer(cls):
+        """
+        Get the hidden visualizer used for headless rendering.
+        
+        The window and its render context are created on first use and kept
+        until the process exits.
+        
+        Returns:
+            open3d.visualization.Visualizer: Hidden visualizer
+        """
+        if cls._offscreen_vis is None:
+            vis = _open3d().visualization.Visualizer()
+            vis.create_window(
+                window_name="Building Model Visualization", width=1280, height=720, visible=False
+            )
+            atexit.register(vis.destroy_window)
+            cls._offscreen_vis = vis
+        return cls._offscreen_vis
+    
+    def visualize_model(self, model_data, output_dir=None, headless=False):
         """
         Visualize a 3D building model using Open3D.
         
         Args:
             model_data: Building model data or path to model file
             output_dir: Directory to save visualization files
+            headless: If True, only render the screenshot to output_dir
+                without opening an interactive window
             
         Returns:
             bool: Success status
         """
         try:
-            # Load the model
-            if isinstance(model_data, str):
-                # Load from file
-                if model_data.endswith('.obj'):
-                    mesh = trimesh.load(model_data)
-                    o3d_mesh = self._trimesh_to_open3d(mesh)
-                elif model_data.endswith('.json'):
-                    with open(model_data, 'r') as f:
-                        model_data = json.load(f)
-                    # Extract mesh path
-                    mesh_path = model_data.get('mesh_path', '')
-                    if mesh_path and os.path.exists(mesh_path):
-                        mesh = trimesh.load(mesh_path)
-                        o3d_mesh = self._trimesh_to_open3d(mesh)
-                    else:
-                        # Create mesh from model data
-                        o3d_mesh = self._create_mesh_from_model(model_data)
-                else:
-                    # Try to load with Open3D
-                    o3d_mesh = o3d.io.read_triangle_mesh(model_data)
-            elif isinstance(model_data, dict) and 'mesh' in model_data:
-                # Convert trimesh to Open3D mesh
-                o3d_mesh = self._trimesh_to_open3d(model_data['mesh'])
-            elif isinstance(model_data, dict):
-                # Create mesh from model data
-                o3d_mesh = self._create_mesh_from_model(model_data)
-            else:
-                raise ValueError("Unsupported model data format")
+            o3d = _open3d()
+            o3d_mesh = self._load_mesh(model_data)
+            
+            # Ensure mesh has normals, meshes built here already carry them
+            if not o3d_mesh.has_vertex_normals():
+                o3d_mesh.compute_vertex_normals()
+            
+            screenshot_path = None
+            if output_dir:
+                os.makedirs(output_dir, exist_ok=True)
+                screenshot_path = os.path.join(output_dir, "building_visualization.png")
             
-            # Ensure mesh has normals
-            o3d_mesh.compute_vertex_normals()
+            if headless:
+                if screenshot_path is None:
+                    raise ValueError("output_dir is required for headless rendering")
+                return self.render_to_file(o3d_mesh, screenshot_path)
             
             # Create a visualization window
             vis = o3d.visualization.Visualizer()
@@ -63,29 +158,13 @@ class ModelVisualizer:
             
             # Add the mesh to the visualization
             vis.add_geometry(o3d_mesh)
-            
-            # Set rendering options
-            opt = vis.get_render_option()
-            opt.background_color = np.array([0.8, 0.8, 0.8])  # Light gray background
-            opt.point_size = 5.0
-            opt.line_width = 2.0
-            
-            # Set camera position
-            ctr = vis.get_view_control()
-            ctr.set_zoom(0.8)
-            ctr.set_front([0, -1, 0])
-            ctr.set_lookat([0, 0, 0])
-            ctr.set_up([0, 0, 1])
+            self._configure_view(vis)
             
             # Save screenshot if output_dir is provided
-            if output_dir:
-                if not os.path.exists(output_dir):
-                    os.makedirs(output_dir)
-                
+            if screenshot_path:
                 # Capture and save screenshot
                 vis.poll_events()
                 vis.update_renderer()
-                screenshot_path = os.path.join(output_dir, "building_visualization.png")
                 vis.capture_screen_image(screenshot_path)
                 print(f"Screenshot saved to {screenshot_path}")
             
@@ -98,6 +177,127 @@ class ModelVisualizer:
             print(f"Error visualizing model: {e}")
             return False
     
+    def render_to_file(self, o3d_mesh, screenshot_path):
+        """
+        Render a mesh to an image file without running the interactive loop.
+        
+        Args:
+            o3d_mesh: Open3D mesh to render
+            screenshot_path: Path of the image file to write
+            
+        Returns:
+            bool: Success status
+        """
+        # Render in the shared hidden window, so no event loop is started
+        vis = self._get_offscreen_visualizer()
+        vis.clear_geometries()
+        vis.add_geometry(o3d_mesh, reset_bounding_box=True)
+        self._configure_view(vis)
+        
+        # Capture and save screenshot
+        vis.poll_events()
+        vis.update_renderer()
+        vis.capture_screen_image(screenshot_path)
+        print(f"Screenshot saved to {screenshot_path}")
+        
+        return True
+    
+    def _load_mesh(self, model_data):
+        """
+        Load an Open3D mesh from model data or a model file.
+        
+        Args:
+            model_data: Building model data or path to model file
+            
+        Returns:
+            open3d.geometry.TriangleMesh: Open3D mesh
+        """
+        o3d = _open3d()
+        
+        if isinstance(model_data, str):
+            # Load from file
+            if model_data.endswith(('.obj', '.glb')):
+                mesh = self._load_trimesh(model_data)
+                return self._trimesh_to_open3d(mesh)
+            elif model_data.endswith('.json'):
+                model_data = self._read_json(model_data)
+                # Extract mesh path
+                mesh_path = model_data.get('mesh_path', '')
+                if mesh_path and os.path.exists(mesh_path):
+                    mesh = self._load_trimesh(mesh_path)
+                    return self._trimesh_to_open3d(mesh)
+                # Create mesh from model data
+                return self._create_mesh_from_model(model_data)
+            # Try to load with Open3D
+            return o3d.io.read_triangle_mesh(model_data)
+        elif isinstance(model_data, dict) and 'mesh' in model_data:
+            # Convert trimesh to Open3D mesh
+            return self._trimesh_to_open3d(model_data['mesh'])
+        elif isinstance(model_data, dict):
+            # Create mesh from model data
+            return self._create_mesh_from_model(model_data)
+        raise ValueError("Unsupported model data format")
+    
+    def _load_trimesh(self, mesh_path):
+        """
+        Load a mesh file with trimesh from a read-only memory map.
+        
+        The file is paged in by the OS as the parser reads it, and the plain
+        load skips vertex merging and validation.
+        
+        Args:
+            mesh_path: Path to the mesh file
+            
+        Returns:
+            trimesh.Trimesh: Loaded mesh
+        """
+        import trimesh
+        
+        file_type = os.path.splitext(mesh_path)[1][1:].lower()
+        with open(mesh_path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            return trimesh.load_mesh(mm, file_type=file_type, process=False, maintain_order=True)
+    
+    def _read_json(self, json_path):
+        """
+        Read a JSON model file.
+        
+        With orjson the file is parsed straight from a read-only memory map
+        instead of being read into a string first.
+        
+        Args:
+            json_path: Path to the JSON file
+            
+        Returns:
+            dict: Parsed model data
+        """
+        if ORJSON_AVAILABLE:
+            with open(json_path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                with memoryview(mm) as view:
+                    return orjson.loads(view)
+        
+        with open(json_path, 'r') as f:
+            return json.load(f)
+    
+    def _configure_view(self, vis):
+        """
+        Apply the render options and camera position to a visualizer.
+        
+        Args:
+            vis: Open3D visualizer with the geometry added
+        """
+        # Set rendering options
+        opt = vis.get_render_option()
+        opt.background_color = np.array([0.8, 0.8, 0.8])  # Light gray background
+        opt.point_size = 5.0
+        opt.line_width = 2.0
+        
+        # Set camera position
+        ctr = vis.get_view_control()
+        ctr.set_zoom(0.8)
+        ctr.set_front([0, -1, 0])
+        ctr.set_lookat([0, 0, 0])
+        ctr.set_up([0, 0, 1])
+    
     def _trimesh_to_open3d(self, trimesh_mesh):
         """
         Convert a trimesh mesh to an Open3D mesh.
@@ -108,22 +308,20 @@ class ModelVisualizer:
         Returns:
             open3d.geometry.TriangleMesh: Open3D mesh
         """
-        # Create an Open3D mesh
-        o3d_mesh = o3d.geometry.TriangleMesh()
+        # Get vertices and faces as contiguous float64/int32 arrays so Open3D
+        # can wrap the buffers directly instead of converting element by
+        # element; arrays already in that layout are used without a copy
+        vertices = np.ascontiguousarray(trimesh_mesh.vertices, dtype=np.float64)
+        faces = np.ascontiguousarray(trimesh_mesh.faces, dtype=np.int32)
         
-        # Set vertices and faces
-        o3d_mesh.vertices = o3d.utility.Vector3dVector(np.array(trimesh_mesh.vertices))
-        o3d_mesh.triangles = o3d.utility.Vector3iVector(np.array(trimesh_mesh.faces))
-        
-        # Set vertex colors if available
+        # Get vertex colors if available
+        colors = None
         if hasattr(trimesh_mesh, 'visual') and hasattr(trimesh_mesh.visual, 'vertex_colors'):
-            colors = np.array(trimesh_mesh.visual.vertex_colors[:, :3]) / 255.0
-            o3d_mesh.vertex_colors = o3d.utility.Vector3dVector(colors)
-        
-        # Compute normals
-        o3d_mesh.compute_vertex_normals()
+            # Scaling the uint8 view produces the float64 array in one allocation
+            colors = np.asarray(trimesh_mesh.visual.vertex_colors)[:, :3] * (1.0 / 255.0)
         
-        return o3d_mesh
+        # Create an Open3D mesh with normals
+        return self._to_open3d_mesh(vertices, faces, colors)
     
     def _create_mesh_from_model(self, model_data):
         """
@@ -135,38 +333,115 @@ class ModelVisualizer:
         Returns:
             open3d.geometry.TriangleMesh: Open3D mesh
         """
-        # Create an empty Open3D mesh
-        o3d_mesh = o3d.geometry.TriangleMesh()
-        
         # Extract building model components
         building_model = model_data.get('building_model', model_data)
         
+        # Collect the (vertices, triangles, color) of every part, and combine
+        # them into a single mesh at the end
+        parts = []
+        
         # Process walls
         walls = building_model.get('walls', [])
         for wall in walls:
-            wall_mesh = self._create_wall_mesh(wall)
-            if wall_mesh:
-                o3d_mesh += wall_mesh
+            wall_part = self._create_wall_mesh(wall)
+            if wall_part is not None:
+                parts.append(wall_part)
         
         # Process openings
         openings = building_model.get('openings', [])
         for opening in openings:
-            opening_mesh = self._create_opening_mesh(opening)
-            if opening_mesh:
-                o3d_mesh += opening_mesh
+            opening_part = self._create_opening_mesh(opening)
+            if opening_part is not None:
+                parts.append(opening_part)
         
         # Process roof
         roof = building_model.get('roof', {})
         floors = building_model.get('floors', [])
-        roof_mesh = self._create_roof_mesh(roof, floors)
-        if roof_mesh:
-            o3d_mesh += roof_mesh
+        roof_part = self._create_roof_mesh(roof, floors)
+        if roof_part is not None:
+            parts.append(roof_part)
         
-        # Compute normals
-        o3d_mesh.compute_vertex_normals()
+        # Create the Open3D mesh, uploading each buffer once
+        if parts:
+            vertex_arrays, triangle_arrays, part_colors = zip(*parts)
+            vertex_counts = [len(vertices) for vertices in vertex_arrays]
+            
+            # Shift each part's triangle indices past the preceding vertices
+            offsets = np.cumsum([0] + vertex_counts[:-1])
+            triangles = np.concatenate([
+                part_triangles + offset
+                for part_triangles, offset in zip(triangle_arrays, offsets)
+            ])
+            
+            # Expand each part's color over its vertices in one pass. Vertex
+            # colors are kept only when every part has one, as when meshes
+            # were combined with +=
+            colors = None
+            if all(color is not None for color in part_colors):
+                colors = np.repeat(np.asarray(part_colors, dtype=np.float64), vertex_counts, axis=0)
+            
+            # Share the corners that adjacent wall segments have in common
+            vertices, triangles, colors = _weld(np.concatenate(vertex_arrays), triangles, colors)
+            
+            o3d_mesh = self._to_open3d_mesh(vertices, triangles.astype(np.int32), colors)
+        else:
+            o3d_mesh = _open3d().geometry.TriangleMesh()
         
         return o3d_mesh
     
+    def _to_open3d_mesh(self, vertices, triangles, colors=None):
+        """
+        Create an Open3D mesh with vertex normals from vertex, triangle and
+        color arrays.
+        
+        The arrays are wrapped by a tensor mesh without copying and converted
+        to a legacy mesh once, rather than copied through Vector3dVector.
+        Normals are computed on the GPU when CUDA is available.
+        
+        Args:
+            vertices: Vertex positions, float64 array of shape (N, 3)
+            triangles: Vertex indices, int32 array of shape (M, 3)
+            colors: Optional RGB vertex colors, float64 array of shape (N, 3)
+            
+        Returns:
+            open3d.geometry.TriangleMesh: Open3D mesh
+        """
+        o3d = _open3d()
+        t_mesh = o3d.t.geometry.TriangleMesh()
+        t_mesh.vertex.positions = o3d.core.Tensor.from_numpy(
+            np.ascontiguousarray(vertices, dtype=np.float64)
+        )
+        t_mesh.triangle.indices = o3d.core.Tensor.from_numpy(
+            np.ascontiguousarray(triangles, dtype=np.int32)
+        )
+        if colors is not None:
+            t_mesh.vertex.colors = o3d.core.Tensor.from_numpy(
+                np.ascontiguousarray(colors, dtype=np.float64)
+            )
+        
+        # Compute normals on the fastest available device
+        device = _compute_device()
+        if device.get_type() != o3d.core.Device.DeviceType.CPU:
+            t_mesh = t_mesh.to(device)
+        t_mesh.compute_vertex_normals()
+        
+        return t_mesh.cpu().to_legacy()
+    
+    def _box_arrays(self, size, origin, color):
+        """
+        Get the arrays of a box scaled from the unit box template.
+        
+        Args:
+            size: Box extent along x, y and z
+            origin: Position of the box's minimum corner
+            color: RGB color of the box
+            
+        Returns:
+            tuple: (vertices, triangles, color) of the box
+        """
+        vertices = _BOX_V * np.asarray(size, dtype=np.float64) + np.asarray(origin, dtype=np.float64)
+        return vertices, _BOX_F, color
+    
     def _create_wall_mesh(self, wall):
         """
         Create an Open3D mesh for a wall.
@@ -175,10 +450,10 @@ class ModelVisualizer:
             wall: Wall data
             
         Returns:
-            open3d.geometry.TriangleMesh: Wall mesh
+            tuple: (vertices, triangles, color) of the wall mesh, color is None
         """
-        # Similar implementation as in BuildingReconstructor._create_wall_mesh
-        # but using Open3D instead of trimesh
+        # Same geometry as BuildingReconstructor._walls_to_mesh: each segment
+        # is a box from one point to the next, centered across its thickness
         points = wall.get('points', [])
         if len(points) < 2:
             return None
@@ -187,42 +462,41 @@ class ModelVisualizer:
         base_height = wall.get('base_height', 0.0)
         thickness = wall.get('thickness', 0.2)
         
-        # Create a box for each wall segment
-        meshes = []
+        # Every segment contributes one box of 8 vertices and 12 triangles,
+        # built for all segments at once
+        points = np.asarray(points, dtype=np.float64)[:, :2]
+        starts = points[:-1]
         
-        for i in range(len(points) - 1):
-            p1 = points[i]
-            p2 = points[i + 1]
-            
-            # Calculate wall length and direction
-            dx = p2[0] - p1[0]
-            dy = p2[1] - p1[1]
-            length = np.sqrt(dx*dx + dy*dy)
-            
-            if length > 0:
-                # Create a box for this wall segment
-                box = o3d.geometry.TriangleMesh.create_box(
-                    width=length, height=thickness, depth=height
-                )
-                
-                # Rotate to align with wall direction
-                angle = np.arctan2(dy, dx)
-                R = o3d.geometry.get_rotation_matrix_from_xyz([0, 0, angle])
-                box.rotate(R, center=[0, 0, 0])
-                
-                # Translate to the correct position
-                box.translate([p1[0], p1[1], base_height])
-                
-                meshes.append(box)
+        # Calculate wall lengths and directions, culling degenerate segments
+        # from duplicate points
+        dx, dy = np.diff(points, axis=0).T
+        lengths = np.hypot(dx, dy)
+        keep = lengths > _MIN_SEGMENT_LENGTH
+        if not keep.any():
+            return None
         
-        if meshes:
-            # Combine all wall segment meshes
-            combined_mesh = meshes[0]
-            for mesh in meshes[1:]:
-                combined_mesh += mesh
-            return combined_mesh
+        starts = starts[keep]
+        lengths = lengths[keep]
+        cos = (dx[keep] / lengths)[:, None]
+        sin = (dy[keep] / lengths)[:, None]
+        count = len(lengths)
         
-        return None
+        # Box corners before rotation, shape (count, 8, 3)
+        sizes = np.column_stack([lengths, np.full(count, thickness), np.full(count, height)])
+        corners = _BOX_V[None, :, :] * sizes[:, None, :]
+        corners[:, :, 1] -= 0.5 * thickness
+        
+        # Rotate to align with wall direction, then translate to the correct
+        # position
+        vertices = np.empty((count, 8, 3))
+        vertices[:, :, 0] = cos * corners[:, :, 0] - sin * corners[:, :, 1] + starts[:, 0:1]
+        vertices[:, :, 1] = sin * corners[:, :, 0] + cos * corners[:, :, 1] + starts[:, 1:2]
+        vertices[:, :, 2] = corners[:, :, 2] + base_height
+        
+        triangles = _BOX_F[None, :, :] + 8 * np.arange(count, dtype=np.int32)[:, None, None]
+        
+        # Walls carry no color
+        return vertices.reshape(-1, 3), triangles.reshape(-1, 3), None
     
     def _create_opening_mesh(self, opening):
         """
@@ -232,7 +506,7 @@ class ModelVisualizer:
             opening: Opening data
             
         Returns:
-            open3d.geometry.TriangleMesh: Opening mesh
+            tuple: (vertices, triangles, color) of the opening mesh
         """
         # Similar implementation as in BuildingReconstructor._create_opening_mesh
         # but using Open3D instead of trimesh
@@ -245,19 +519,13 @@ class ModelVisualizer:
             height = opening.get('height', 1.0)
             floor = opening.get('floor', 0)
             
-            # Create a box for the window
-            window_mesh = o3d.geometry.TriangleMesh.create_box(
-                width=width, height=0.1, depth=height
-            )
-            
-            # Translate to the correct position
+            # Create a blue box for the window at the correct position
             window_height = floor * 3.0 + 1.0  # Simple height calculation
-            window_mesh.translate([position[0], position[1], window_height])
-            
-            # Set color (blue for windows)
-            window_mesh.paint_uniform_color([0.3, 0.5, 0.8])
-            
-            return window_mesh
+            return self._box_arrays(
+                (width, 0.1, height),
+                (position[0], position[1], window_height),
+                (0.3, 0.5, 0.8)
+            )
             
         elif opening_type == 'door':
             # Create door mesh
@@ -269,19 +537,16 @@ class ModelVisualizer:
                 radius = opening.get('radius', 0.9)
                 floor = opening.get('floor', 0)
                 
-                # Create a cylinder for the door
-                door_mesh = o3d.geometry.TriangleMesh.create_cylinder(
-                    radius=radius, height=2.0
-                )
+                # Create a cylinder for the door by scaling the unit template
+                cylinder_vertices, cylinder_triangles = _cylinder_template(2.0)
                 
                 # Translate to the correct position
                 door_height = floor * 3.0  # Simple height calculation
-                door_mesh.translate([position[0], position[1], door_height])
+                vertices = cylinder_vertices * (radius, radius, 1.0)
+                vertices += (position[0], position[1], door_height)
                 
-                # Set color (brown for doors)
-                door_mesh.paint_uniform_color([0.6, 0.4, 0.2])
-                
-                return door_mesh
+                # Brown for doors
+                return vertices, cylinder_triangles, (0.6, 0.4, 0.2)
                 
             else:
                 # Standard door
@@ -290,19 +555,13 @@ class ModelVisualizer:
                 height = opening.get('height', 2.0)
                 floor = opening.get('floor', 0)
                 
-                # Create a box for the door
-                door_mesh = o3d.geometry.TriangleMesh.create_box(
-                    width=width, height=0.1, depth=height
-                )
-                
-                # Translate to the correct position
+                # Create a brown box for the door at the correct position
                 door_height = floor * 3.0  # Simple height calculation
-                door_mesh.translate([position[0], position[1], door_height])
-                
-                # Set color (brown for doors)
-                door_mesh.paint_uniform_color([0.6, 0.4, 0.2])
-                
-                return door_mesh
+                return self._box_arrays(
+                    (width, 0.1, height),
+                    (position[0], position[1], door_height),
+                    (0.6, 0.4, 0.2)
+                )
         
         return None
     
@@ -315,7 +574,7 @@ class ModelVisualizer:
             floor_heights: List of floor heights
             
         Returns:
-            open3d.geometry.TriangleMesh: Roof mesh
+            tuple: (vertices, triangles, color) of the roof mesh
         """
         # Similar implementation as in BuildingReconstructor._create_roof_mesh
         # but using Open3D instead of trimesh
@@ -332,34 +591,28 @@ class ModelVisualizer:
             # Create a flat roof
             roof_height = roof.get('height', 0.5)
             
-            # Get the outline points
-            for wall in outline:
-                points = wall.get('points', [])
-                if points:
-                    # For simplicity, create a box based on the bounding box
-                    min_x = min(p[0] for p in points)
-                    min_y = min(p[1] for p in points)
-                    max_x = max(p[0] for p in points)
-                    max_y = max(p[1] for p in points)
-                    
-                    width = max_x - min_x
-                    depth = max_y - min_y
-                    
-                    roof_mesh = o3d.geometry.TriangleMesh.create_box(
-                        width=width, height=depth, depth=roof_height
-                    )
-                    
-                    # Translate to the correct position
-                    roof_mesh.translate([
-                        min_x,
-                        min_y,
-                        top_floor_height
-                    ])
-                    
-                    # Set color (gray for roof)
-                    roof_mesh.paint_uniform_color([0.7, 0.7, 0.7])
-                    
-                    return roof_mesh
+            # Gather the points of every outline wall
+            point_arrays = [
+                np.asarray(wall['points'], dtype=np.float64)[:, :2]
+                for wall in outline if wall.get('points')
+            ]
+            
+            if point_arrays:
+                # For simplicity, create a box based on the bounding box of
+                # the whole outline
+                all_points = np.concatenate(point_arrays)
+                min_x, min_y = all_points.min(axis=0)
+                max_x, max_y = all_points.max(axis=0)
+                
+                width = max_x - min_x
+                depth = max_y - min_y
+                
+                # Gray box at the correct position
+                return self._box_arrays(
+                    (width, depth, roof_height),
+                    (min_x, min_y, top_floor_height),
+                    (0.7, 0.7, 0.7)
+                )
         
         # For other roof types, we would implement specific mesh creation
         # For now, we'll default to a flat roof
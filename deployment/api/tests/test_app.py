@@ -8,6 +8,7 @@ import tempfile
 # Add parent directory to path to import app
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
+import app as app_module
 from app import app
 
 class TestApp(unittest.TestCase):
@@ -25,6 +26,9 @@ class TestApp(unittest.TestCase):
         
         self.upload_folder_patcher.start()
         self.results_folder_patcher.start()
+        
+        # Let each test create the modules under its own patches
+        app_module.services.clear()
     
     def tearDown(self):
         # Stop patches
@@ -43,6 +47,18 @@ class TestApp(unittest.TestCase):
         data = json.loads(response.data)
         self.assertEqual(data['status'], 'ok')
     
+    @patch('app.ImageProcessor')
+    def test_services_created_once(self, mock_image_processor):
+        """Test that concurrent first requests share one module instance."""
+        from concurrent.futures import ThreadPoolExecutor
+        
+        mock_image_processor.side_effect = lambda: MagicMock()
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            instances = list(executor.map(lambda _: app_module.get_image_processor(), range(32)))
+        
+        self.assertEqual(mock_image_processor.call_count, 1)
+        self.assertTrue(all(instance is instances[0] for instance in instances))
+    
     @patch('app.ImageProcessor')
     def test_upload_file_no_file(self, mock_image_processor):
         """Test upload endpoint with no file."""
@@ -157,6 +173,63 @@ class TestApp(unittest.TestCase):
         self.assertEqual(data['model_file'], 'building_model.obj')
         self.assertEqual(data['gbxml_file'], 'building_model.gbxml')
     
+    def test_generate_model_async(self):
+        """Test generate model endpoint with a background job."""
+        response = self.client.post('/api/generate-model', json={
+            'floorPlans': ['floor1.json'],
+            'elevations': ['north.json'],
+            'async': True
+        })
+        self.assertEqual(response.status_code, 202)
+        data = json.loads(response.data)
+        self.assertTrue(data['success'])
+        job_id = data['job_id']
+        
+        # Wait for the job, then check its status
+        app_module.jobs[job_id].result(timeout=30)
+        response = self.client.get(f'/api/jobs/{job_id}')
+        self.assertEqual(response.status_code, 200)
+        data = json.loads(response.data)
+        self.assertEqual(data['status'], 'finished')
+        self.assertEqual(data['model_file'], 'building_model.obj')
+        
+        # Finished jobs are forgotten once polled
+        response = self.client.get(f'/api/jobs/{job_id}')
+        self.assertEqual(response.status_code, 404)
+    
+    @patch('app.build_model', return_value={'model_file': 'building_model.obj'})
+    def test_unpolled_job_expires(self, mock_build_model):
+        """Test that finished jobs are dropped after JOB_TTL without polling."""
+        response = self.client.post('/api/generate-model', json={
+            'floorPlans': ['floor1.json'],
+            'elevations': ['north.json'],
+            'async': True
+        })
+        job_id = json.loads(response.data)['job_id']
+        app_module.jobs[job_id].result(timeout=30)
+        
+        # Done callbacks run just after result() returns
+        import time
+        deadline = time.monotonic() + 30
+        while job_id not in app_module.job_finished and time.monotonic() < deadline:
+            time.sleep(0.01)
+        
+        # Still available within the TTL
+        app_module.expire_jobs()
+        self.assertIn(job_id, app_module.jobs)
+        
+        with patch('app.JOB_TTL', -1):
+            app_module.expire_jobs()
+        self.assertNotIn(job_id, app_module.jobs)
+        self.assertNotIn(job_id, app_module.job_finished)
+    
+    def test_get_job_not_found(self):
+        """Test job status endpoint with an unknown job."""
+        response = self.client.get('/api/jobs/unknown')
+        self.assertEqual(response.status_code, 404)
+        data = json.loads(response.data)
+        self.assertEqual(data['error'], 'Job not found')
+    
     def test_get_result_file_not_found(self):
         """Test get result file endpoint with non-existent file."""
         response = self.client.get('/api/results/nonexistent.json')
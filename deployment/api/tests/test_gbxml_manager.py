@@ -0,0 +1,89 @@
+import os
+import sys
+import unittest
+from unittest.mock import patch
+import json
+import tempfile
+
+# Add parent directory to path to import modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from gbxml.gbxml_manager import GbXMLManager
+
+class TestGbXMLManager(unittest.TestCase):
+    def setUp(self):
+        self.gbxml_manager = GbXMLManager()
+        
+        # Create a temporary directory holding a simple building model
+        self.temp_dir = tempfile.mkdtemp()
+        self.model_path = os.path.join(self.temp_dir, 'building_model.json')
+        self.write_model([[0, 0, 0], [1, 0, 0], [0, 1, 0]])
+    
+    def tearDown(self):
+        # Clean up temporary directory
+        import shutil
+        shutil.rmtree(self.temp_dir)
+    
+    def write_model(self, vertices):
+        """Write a one-triangle building model with the given vertices."""
+        with open(self.model_path, 'w') as f:
+            json.dump({'vertices': vertices, 'faces': [[0, 1, 2]]}, f)
+    
+    def convert_and_mark(self):
+        """Convert the model, then replace the output with a marker."""
+        gbxml_path = self.gbxml_manager.convert_building_model(self.model_path, self.temp_dir)
+        with open(gbxml_path, 'w') as f:
+            f.write('marker')
+        return gbxml_path
+    
+    def read(self, path):
+        """Read a text file."""
+        with open(path) as f:
+            return f.read()
+    
+    def test_convert_building_model(self):
+        """Test converting a building model to gbXML."""
+        gbxml_path = self.gbxml_manager.convert_building_model(self.model_path, self.temp_dir)
+        self.assertEqual(gbxml_path, os.path.join(self.temp_dir, 'building_model.gbxml'))
+        content = self.read(gbxml_path)
+        self.assertIn('<gbXML', content)
+        self.assertEqual(content.count('<CartesianPoint>'), 3)
+        
+        # The content hash is kept out of the output directory listing
+        self.assertNotIn('building_model.gbxml.blake2b', os.listdir(self.temp_dir))
+    
+    def test_cache_hit(self):
+        """Test that an unchanged model reuses the existing file."""
+        gbxml_path = self.convert_and_mark()
+        self.gbxml_manager.convert_building_model(self.model_path, self.temp_dir)
+        self.assertEqual(self.read(gbxml_path), 'marker')
+    
+    def test_cache_miss_on_changed_model(self):
+        """Test that a changed model is converted again."""
+        gbxml_path = self.convert_and_mark()
+        self.write_model([[0, 0, 0], [2, 0, 0], [0, 2, 0]])
+        self.gbxml_manager.convert_building_model(self.model_path, self.temp_dir)
+        self.assertIn('<gbXML', self.read(gbxml_path))
+    
+    def test_cache_miss_on_generator_version(self):
+        """Test that a new generator version converts the model again."""
+        gbxml_path = self.convert_and_mark()
+        with patch('gbxml.gbxml_manager.GENERATOR_VERSION', 'test'):
+            self.gbxml_manager.convert_building_model(self.model_path, self.temp_dir)
+        self.assertIn('<gbXML', self.read(gbxml_path))
+    
+    def test_failed_conversion_drops_key(self):
+        """Test that a failed write leaves no hash to match the old file."""
+        gbxml_path = self.convert_and_mark()
+        self.write_model([[0, 0, 0], [2, 0, 0], [0, 2, 0]])
+        with patch.object(GbXMLManager, '_write_atomic', side_effect=OSError):
+            with self.assertRaises(OSError):
+                self.gbxml_manager.convert_building_model(self.model_path, self.temp_dir)
+        
+        # Converting the original model again must not return the stale file
+        self.write_model([[0, 0, 0], [1, 0, 0], [0, 1, 0]])
+        self.gbxml_manager.convert_building_model(self.model_path, self.temp_dir)
+        self.assertIn('<gbXML', self.read(gbxml_path))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -230,6 +230,24 @@ class TestImageProcessor(unittest.TestCase):
         
         # Check that floor levels were detected
         self.assertTrue(len(result['elevation_data']['floor_levels']) > 0)
+    
+    def test_process_batch(self):
+        # Process two copies of the test image in worker processes
+        second_image_path = os.path.join(self.temp_dir, 'second_image.png')
+        cv2.imwrite(second_image_path, self.test_image)
+        
+        results = self.image_processor.process_batch(
+            [self.test_image_path, second_image_path],
+            plan_type='elevation'
+        )
+        
+        # Check that results come back in input order
+        self.assertEqual([result['image_id'] for result in results], ['test_image', 'second_image'])
+        for result in results:
+            self.assertEqual(result['plan_type'], 'elevation')
+        
+        # Check that an empty batch does not start a pool
+        self.assertEqual(self.image_processor.process_batch([]), [])
 
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
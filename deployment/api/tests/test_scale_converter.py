@@ -0,0 +1,51 @@
+import os
+import sys
+import unittest
+import numpy as np
+
+# Add parent directory to path to import modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from image_processing.scale_converter import ScaleConverter
+
+class TestScaleConverter(unittest.TestCase):
+    def setUp(self):
+        self.scale_converter = ScaleConverter()
+        self.scale_converter.set_scale('plan', 100, 5, 'feet')
+    
+    def test_factor_default(self):
+        """Test that images without a scale use a factor of 1.0."""
+        self.assertEqual(self.scale_converter.factor('unknown'), 1.0)
+        self.assertEqual(
+            self.scale_converter.get_scale('unknown'),
+            {'scale_factor': 1.0, 'unit': 'meters'}
+        )
+    
+    def test_factor_registered(self):
+        """Test the factor and scale information of a registered image."""
+        self.assertEqual(self.scale_converter.factor('plan'), 0.05)
+        self.assertEqual(
+            self.scale_converter.get_scale('plan'),
+            {'scale_factor': 0.05, 'unit': 'feet'}
+        )
+        self.assertEqual(self.scale_converter.scales['plan']['scale_factor'], 0.05)
+    
+    def test_scale_array(self):
+        """Test converting an array of pixel values."""
+        result = self.scale_converter.scale_array('plan', [[0, 20], [40, 60]])
+        np.testing.assert_allclose(result, [[0.0, 1.0], [2.0, 3.0]])
+        
+        # Without a scale the values are returned as floats unchanged
+        result = self.scale_converter.scale_array('unknown', [1, 2])
+        self.assertEqual(result.dtype, np.float64)
+        np.testing.assert_array_equal(result, [1.0, 2.0])
+    
+    def test_scale_array_in_place(self):
+        """Test scaling an array in place through out."""
+        values = np.array([[0.0, 20.0], [40.0, 60.0]])
+        result = self.scale_converter.scale_array('plan', values, out=values)
+        self.assertIs(result, values)
+        np.testing.assert_allclose(values, [[0.0, 1.0], [2.0, 3.0]])
+
+if __name__ == '__main__':
+    unittest.main()